@@ -1,12 +1,9 @@
-from kaggle.api.kaggle_api_extended import KaggleApi
+from sinkron_dataset import tandai_sumber_berubah, sinkron_kaggle
 
-api = KaggleApi()
-api.authenticate()
-
-api.dataset_download_files(
-    "krishnavamsis/nike-sales",
-    path="nike_dataset",
-    unzip=True
-)
-
-print("Download selesai, cek folder nike_dataset")
+# Zip dataset hanya diunduh & diekstrak ulang kalau isinya berubah.
+# Kredensial diambil dari KAGGLE_USERNAME/KAGGLE_KEY atau ~/.kaggle/kaggle.json
+if sinkron_kaggle(folder="nike_dataset"):
+    tandai_sumber_berubah()
+    print("Download selesai, cek folder nike_dataset")
+else:
+    print("Dataset Kaggle tidak berubah, cek folder nike_dataset")
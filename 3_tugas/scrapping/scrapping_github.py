@@ -1,15 +1,15 @@
-import requests
+from sinkron_dataset import URL_GITHUB, tandai_sumber_berubah, sinkron
 
-url = "https://raw.githubusercontent.com/ham407/Analisis-Penjualan-Produk-Nike-U.S.-Tahun-2020---2021/main/Nike%20Dataset.csv"
+url = URL_GITHUB
 
-# Minta (request) data ke internet
-res = requests.get(url)
-
-# Mengecek apakah berhasil (angka 200 melambangkan berhasil)
-if res.status_code == 200:
-    # Buka file baru di komputer (mode 'wb' = write binary)
-    with open("nike_dataset_scrapping.csv", "wb") as file:
-        file.write(res.content)
-    print("Berhasil! File tersimpan dengan nama 'nike_dataset_scrapping.csv'")
-else:
-    print("Gagal mendownload.")
\ No newline at end of file
+# Download di-stream ke disk per chunk, dilanjutkan kalau sempat terputus,
+# dan dilewati kalau file di server tidak berubah (ETag / checksum)
+try:
+    berubah = sinkron(url, "nike_dataset_scrapping.csv")
+    if berubah:
+        tandai_sumber_berubah()
+        print("Berhasil! File tersimpan dengan nama 'nike_dataset_scrapping.csv'")
+    else:
+        print("File 'nike_dataset_scrapping.csv' sudah versi terbaru.")
+except Exception as e:
+    print(f"Gagal mendownload: {e}")
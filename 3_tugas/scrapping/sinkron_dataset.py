@@ -0,0 +1,223 @@
+# ==========================================
+# SINKRONISASI DATASET (RESUMABLE + CHECKSUM)
+# ==========================================
+# Satu tool untuk mengunduh dataset Nike dari GitHub dan Kaggle:
+# - download di-stream ke disk per chunk (tidak ditampung di memori)
+# - download yang terputus dilanjutkan dengan header Range
+# - ETag / Last-Modified + checksum SHA-256 untuk skip sumber yang tidak berubah
+# - file tujuan diganti secara atomik; kalau isinya berubah, versi sumber di folder
+#   cache dinaikkan supaya dashboard membangun ulang cache-nya (tanpa menghapus file)
+#
+# Contoh (bisa diarahkan ke server HTTP lokal untuk uji coba):
+#   python 3_tugas/scrapping/sinkron_dataset.py
+#   python 3_tugas/scrapping/sinkron_dataset.py --url http://127.0.0.1:8000/data.csv --tujuan data.csv
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+import zipfile
+
+import requests
+
+URL_GITHUB = "https://raw.githubusercontent.com/ham407/Analisis-Penjualan-Produk-Nike-U.S.-Tahun-2020---2021/main/Nike%20Dataset.csv"
+URL_KAGGLE = "https://www.kaggle.com/api/v1/datasets/download/krishnavamsis/nike-sales"
+
+# Folder cache dashboard (hash baris, file kolumnar, dst). Isinya dipakai
+# bersama dan tidak dihapus; yang dinaikkan hanya penanda versi sumber yang
+# ikut jadi kunci cache di dashboard.
+DIR_CACHE = "cache"
+NAMA_VERSI_SUMBER = "versi_sumber.json"
+
+UKURAN_CHUNK = 1024 * 1024
+
+
+def _baca_meta(path_meta):
+    try:
+        with open(path_meta, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _tulis_meta(path_meta, meta):
+    # tulis ke file sementara dulu supaya metadata tidak pernah setengah jadi
+    sementara = path_meta + ".tmp"
+    with open(sementara, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(sementara, path_meta)
+
+
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for blok in iter(lambda: f.read(UKURAN_CHUNK), b""):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def tandai_sumber_berubah(dir_cache=DIR_CACHE):
+    # file cache yang sedang dipakai dashboard (Parquet, hash) tidak disentuh;
+    # cukup naikkan versi supaya loader yang ter-cache dibangun ulang saat rerun berikutnya
+    os.makedirs(dir_cache, exist_ok=True)
+    path_versi = os.path.join(dir_cache, NAMA_VERSI_SUMBER)
+    versi = _baca_meta(path_versi).get("versi", 0) + 1
+    _tulis_meta(path_versi, {"versi": versi, "waktu": time.strftime("%Y-%m-%d %H:%M:%S")})
+    print(f"Versi sumber di '{path_versi}' dinaikkan ke {versi}.")
+    return versi
+
+
+def sinkron(url, tujuan, auth=None, timeout=30, session=None):
+    """Unduh ``url`` ke ``tujuan`` kalau isinya berubah.
+
+    Mengembalikan True kalau file tujuan diganti dengan isi baru,
+    False kalau sumber tidak berubah.
+    """
+    session = session or requests.Session()
+    path_meta = tujuan + ".meta.json"
+    path_part = tujuan + ".part"
+    meta = _baca_meta(path_meta)
+
+    headers = {}
+    ada_tujuan = os.path.exists(tujuan)
+    ada_part = os.path.exists(path_part)
+
+    if ada_part and meta.get("part_validator"):
+        # lanjutkan download yang terputus; If-Range memastikan server
+        # mengirim file utuh lagi kalau sumbernya sudah berubah
+        headers["Range"] = f"bytes={os.path.getsize(path_part)}-"
+        headers["If-Range"] = meta["part_validator"]
+    elif ada_tujuan:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    with session.get(url, headers=headers, auth=auth, stream=True, timeout=timeout) as res:
+        if res.status_code == 304:
+            print(f"Tidak berubah (304): {tujuan}")
+            return False
+        if res.status_code == 416:
+            # part sudah lengkap atau tidak valid lagi; mulai ulang dari awal
+            os.remove(path_part)
+            meta.pop("part_validator", None)
+            _tulis_meta(path_meta, meta)
+            return sinkron(url, tujuan, auth=auth, timeout=timeout, session=session)
+        res.raise_for_status()
+
+        etag = res.headers.get("ETag")
+        last_modified = res.headers.get("Last-Modified")
+        lanjut = res.status_code == 206
+
+        h = hashlib.sha256()
+        if lanjut:
+            with open(path_part, "rb") as f:
+                for blok in iter(lambda: f.read(UKURAN_CHUNK), b""):
+                    h.update(blok)
+            print(f"Melanjutkan download dari byte {os.path.getsize(path_part):,}")
+
+        # simpan validator sebelum download, supaya bisa di-resume kalau terputus
+        validator = etag or last_modified
+        if validator:
+            meta["part_validator"] = validator
+        else:
+            meta.pop("part_validator", None)
+        _tulis_meta(path_meta, meta)
+
+        with open(path_part, "ab" if lanjut else "wb") as f:
+            for blok in res.iter_content(chunk_size=UKURAN_CHUNK):
+                f.write(blok)
+                h.update(blok)
+
+    checksum = h.hexdigest()
+    meta.pop("part_validator", None)
+    meta.update({"url": url, "etag": etag, "last_modified": last_modified})
+
+    if ada_tujuan and meta.get("sha256") == checksum and _sha256_file(tujuan) == checksum:
+        # header berubah tapi isinya sama; file lama tetap dipakai
+        os.remove(path_part)
+        _tulis_meta(path_meta, meta)
+        print(f"Isi sama (checksum cocok): {tujuan}")
+        return False
+
+    os.replace(path_part, tujuan)
+    meta["sha256"] = checksum
+    _tulis_meta(path_meta, meta)
+    print(f"Tersimpan: {tujuan} ({os.path.getsize(tujuan):,} byte)")
+    return True
+
+
+def auth_kaggle():
+    # kredensial dari env var atau ~/.kaggle/kaggle.json (sama seperti kaggle CLI)
+    user, key = os.environ.get("KAGGLE_USERNAME"), os.environ.get("KAGGLE_KEY")
+    if not (user and key):
+        try:
+            with open(os.path.expanduser("~/.kaggle/kaggle.json"), encoding="utf-8") as f:
+                cred = json.load(f)
+            user, key = cred["username"], cred["key"]
+        except (OSError, ValueError, KeyError):
+            return None
+    return (user, key)
+
+
+def _path_di_dalam(folder, nama):
+    # tolak nama anggota zip yang keluar dari folder tujuan ("../", path absolut)
+    dasar = os.path.realpath(folder)
+    target = os.path.realpath(os.path.join(dasar, nama))
+    try:
+        aman = os.path.commonpath([dasar, target]) == dasar and target != dasar
+    except ValueError:
+        # drive berbeda di Windows
+        aman = False
+    if not aman:
+        raise ValueError(f"Nama file di zip tidak aman: {nama!r}")
+    return target
+
+
+def sinkron_kaggle(folder="nike_dataset", url=URL_KAGGLE, auth=None):
+    # zip hanya diekstrak ulang kalau isinya berubah
+    os.makedirs(folder, exist_ok=True)
+    path_zip = os.path.join(folder, "nike-sales.zip")
+    berubah = sinkron(url, path_zip, auth=auth or auth_kaggle())
+    if berubah or not any(n.endswith(".csv") for n in os.listdir(folder)):
+        with zipfile.ZipFile(path_zip) as zf:
+            # semua nama dicek dulu supaya zip yang tidak aman tidak diekstrak sebagian;
+            # entri folder dilewati, foldernya dibuat saat file di dalamnya diekstrak
+            anggota = [
+                (nama, _path_di_dalam(folder, nama))
+                for nama in zf.namelist() if not nama.endswith("/")
+            ]
+            for nama, target in anggota:
+                # ekstrak lewat file sementara supaya penggantian CSV tetap atomik
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with zf.open(nama) as src, open(target + ".part", "wb") as dst:
+                    shutil.copyfileobj(src, dst, UKURAN_CHUNK)
+                os.replace(target + ".part", target)
+        print(f"Ekstrak selesai ke folder {folder}")
+    return berubah
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sinkronisasi dataset Nike (resumable + checksum).")
+    parser.add_argument("--url", help="URL sumber (default: dataset GitHub & Kaggle)")
+    parser.add_argument("--tujuan", default="nike_dataset_scrapping.csv", help="File tujuan untuk --url")
+    parser.add_argument("--tanpa-kaggle", action="store_true", help="Lewati sumber Kaggle")
+    parser.add_argument("--dir-cache", default=DIR_CACHE, help="Folder cache dashboard")
+    args = parser.parse_args()
+
+    if args.url:
+        berubah = sinkron(args.url, args.tujuan)
+    else:
+        berubah = sinkron(URL_GITHUB, args.tujuan)
+        if not args.tanpa_kaggle:
+            berubah = sinkron_kaggle() or berubah
+
+    if berubah:
+        tandai_sumber_berubah(args.dir_cache)
+    else:
+        print("Semua sumber tidak berubah, cache dashboard tetap dipakai.")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,16 +9,19 @@ import streamlit as st
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
+# modul validasi ada di root repo
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from validasi_data import tulis_laporan, validasi
+
 # Membaca file excel
 df = pd.read_csv("dataset keggle/data_hasil_scrapping.csv")
 
-# pengecekan apakah ada list yang duplikat
-sama = df[df.duplicated()]
-
-# Data Cleaning (Mengecek apakah ada data yang sama atau kosong)
-df = df.drop_duplicates()
-df.columns = df.columns.str.strip()
-df['State'] = df['State'].str.strip().str.title()
+# Data Cleaning: duplikat dicek lewat hash per baris, nama kolom & State dirapikan,
+# tanggal/skema/nilai dicek dan hasilnya ditulis ke laporan kualitas
+df, _, laporan = validasi(df)
+tulis_laporan(laporan)
 
 # Perhitungan Kolom IDR
 kurs = 16900
@@ -46,6 +49,10 @@ st.subheader("Data Product Nike")
 row, columns = df.shape
 st.write(f'Listings terdiri atas {row} baris dan {columns} kolom')
 
+# ringkasan kualitas data
+st.write(f"Duplikat yang dihapus: {laporan['duplikat_dalam_batch']}, "
+         f"tanggal tidak valid: {laporan['tanggal_tidak_valid']}")
+
 # menampilkan dataframe
 st.dataframe(df, column_config={
     "Waktu Transaksi": st.column_config.DateColumn(format="DD/MM/YYYY") #Membuat  tanggal sesuai urutan
@@ -9,17 +9,20 @@ import streamlit as st
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
+# modul validasi ada di root repo
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from validasi_data import validasi
+
 # Membaca file CSV yang baru
 df = pd.read_csv("dataset keggle/data_hasil_scrapping.csv")
 
-# pengecekan apakah ada list yang duplikat dan menghapusnya
-df = df.drop_duplicates()
-
-# perbaikan jika ada spasi pada nama kolom
-df.columns = df.columns.str.strip()
+# pengecekan duplikat (lewat hash per baris) dan perbaikan spasi pada nama kolom
+df, _, _ = validasi(df)
 
 # Mengambil data kolom redion dan Total Sales
-regional_performance = df.groupby('Region')['Total Sales'].sum().sort_values(ascending=True)
+regional_performance = df.groupby('Region', observed=True)['Total Sales'].sum().sort_values(ascending=True)
 
 # menambahkan judul
 st.header("Analisis Performa Penjualan Berdasarkan Wilayah")
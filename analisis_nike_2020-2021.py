@@ -11,8 +11,19 @@ from streamlit_folium import st_folium
 import warnings
 import time
 import io
+import os
+import json
 import requests
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+
+from sampling_strata import buat_sampel_strata, estimasi_total, estimasi_total_keseluruhan
+from validasi_data import simpan_hash, tulis_laporan, validasi
+from ranking_produk import tier_produk
+from geo_wilayah import REGIONS, STATE_COORDS, petakan_titik
+from folium.plugins import FastMarkerCluster
+import duckdb
+from kueri_sql import BATAS_BARIS, CONTOH_QUERY, QueryTidakValid, buka_koneksi, jalankan_query, siapkan_parquet
 
 # Ignore future warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
@@ -20,6 +31,9 @@ warnings.simplefilter(action='ignore', category=FutureWarning)
 # ==========================================
 # FUNGSI HELPER SCRAPING
 # ==========================================
+# Bisa diarahkan ke server pengganti lokal (mis. saat uji beban)
+NIKE_BASE_URL = os.environ.get("NIKE_BASE_URL", "https://www.nike.com")
+
 def clean_price(text):
     num = ''.join(c for c in text if c.isdigit())
     return int(num) if num else 0
@@ -43,7 +57,7 @@ def scrape_nike(max_pages):
         status_text.caption(f"Sedang memproses halaman {page + 1} dari {max_pages}...")
 
         offset = page * 24
-        url = f"https://www.nike.com/w/mens-shoes-nik1zy7ok?offset={offset}"
+        url = f"{NIKE_BASE_URL}/w/mens-shoes-nik1zy7ok?offset={offset}"
 
         try:
             res = requests.get(url, headers=headers, timeout=10)
@@ -59,7 +73,7 @@ def scrape_nike(max_pages):
 
                     link = card.select_one("a")["href"]
                     if not link.startswith("http"):
-                        link = "https://www.nike.com" + link
+                        link = NIKE_BASE_URL + link
 
                     img_tag = card.select_one("img")
                     img = img_tag["src"] if img_tag else ""
@@ -85,6 +99,141 @@ def scrape_nike(max_pages):
 
     return df_res
 
+# ==========================================
+# FUNGSI HELPER AGREGASI (EKSAK & SAMPLING)
+# ==========================================
+# Mode cepat otomatis aktif kalau jumlah baris melewati batas ini
+BATAS_MODE_CEPAT = 1_000_000
+
+# Kurs USD -> IDR
+KURS_IDR = 16900
+
+def cocok_produk(kolom, query):
+    return kolom.astype(str).str.lower().str.contains(query.lower(), na=False)
+
+def hitung_agregat(data, query):
+    # Agregat eksak untuk tab Top Produk, Wilayah dan Peta
+    if query:
+        data = data[cocok_produk(data["Product"], query)]
+
+    # tidak di-sort di sini; urutan & tier dihitung dengan partial selection
+    produk = (
+        data.groupby("Product", sort=False, observed=True)["Units Sold"]
+        .sum().reset_index()
+    )
+    wilayah = data.groupby("Region", observed=True).agg({
+        "Units Sold": "sum",
+        "Total Sales": "sum",
+        "Total Sales IDR": "sum"
+    }).reset_index()
+    state = data.groupby("State", observed=True).agg({
+        "Units Sold": "sum",
+        "Total Sales": "sum"
+    }).reset_index()
+
+    return {
+        "eksak": True,
+        "baris": len(data),
+        "produk": produk,
+        "wilayah": wilayah,
+        "state": state,
+        "total_sales": data["Total Sales"].sum(),
+        "total_sales_ci": 0.0,
+    }
+
+def hitung_agregat_sampel(sampel, query, kurs):
+    # Taksiran dari sampel berstrata, lengkap dengan selang kepercayaan 95%
+    mask = cocok_produk(sampel["Product"], query).to_numpy() if query else None
+    baris = sampel["_N"] / sampel["_n"]
+    if mask is not None:
+        baris = baris[mask]
+
+    produk = estimasi_total(sampel, "Units Sold", "Product", mask=mask)
+
+    units_reg = estimasi_total(sampel, "Units Sold", "Region", mask=mask)
+    sales_reg = estimasi_total(sampel, "Total Sales", "Region", mask=mask)
+    wilayah = units_reg.merge(sales_reg, on="Region", suffixes=(" Units", " Sales"))
+    wilayah = wilayah.rename(columns={"± CI Units": "± CI Units Sold", "± CI Sales": "± CI Total Sales"})
+    wilayah["Total Sales IDR"] = wilayah["Total Sales"] * kurs
+    wilayah = wilayah[["Region", "Units Sold", "± CI Units Sold", "Total Sales", "± CI Total Sales", "Total Sales IDR"]]
+
+    units_st = estimasi_total(sampel, "Units Sold", "State", mask=mask)
+    sales_st = estimasi_total(sampel, "Total Sales", "State", mask=mask)
+    state = units_st.merge(sales_st, on="State", suffixes=(" Units", " Sales"))
+    state = state.rename(columns={"± CI Units": "± CI Units Sold", "± CI Sales": "± CI Total Sales"})
+
+    total_sales, total_sales_ci = estimasi_total_keseluruhan(sampel, "Total Sales", mask=mask)
+
+    return {
+        "eksak": False,
+        "baris": int(round(baris.sum())),
+        "produk": produk,
+        "wilayah": wilayah,
+        "state": state,
+        "total_sales": total_sales,
+        "total_sales_ci": total_sales_ci,
+    }
+
+def tambah_kolom_turunan(data, kurs=KURS_IDR):
+    # kolom IDR & kategori dihitung vektor, sekali per versi file (bukan tiap rerun)
+    if "Total Sales" in data.columns:
+        data["Total Sales IDR"] = data["Total Sales"] * kurs
+    if "Price per Unit" in data.columns:
+        data["price per unit IDR"] = data["Price per Unit"] * kurs
+    if "Units Sold" in data.columns:
+        units = data["Units Sold"].to_numpy(dtype="float64")
+        data["kategori"] = np.select(
+            [units < 50, units <= 80], ["Kurang Laku", "Laku"], default="Sangat Laku"
+        )
+    return data
+
+def versi_sumber(path=os.path.join("cache", "versi_sumber.json")):
+    # dinaikkan oleh sinkron_dataset.py setiap kali dataset sumber berubah;
+    # ikut jadi kunci loader di bawah supaya cache dibangun ulang tanpa menghapus file
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("versi", 0)
+    except (OSError, ValueError):
+        return 0
+
+@st.cache_resource(show_spinner="Memuat & memvalidasi data...")
+def muat_data(path_csv, mtime, versi):
+    # Validasi (dedup berbasis hash, cek skema/tanggal/nilai) hanya jalan sekali per versi file.
+    # cache_resource: DataFrame dipakai bersama tanpa disalin tiap rerun, jadi jangan diubah di luar fungsi ini
+    data, hashes, laporan = validasi(pd.read_csv(path_csv))
+    simpan_hash(hashes)
+    tulis_laporan(laporan)
+    return tambah_kolom_turunan(data), laporan
+
+@st.cache_data(show_spinner="Menyiapkan sampel berstrata...")
+def sampel_data(_data, kunci):
+    # `kunci` (sumber file + waktu modifikasi + versi sumber + jumlah baris) menggantikan hashing DataFrame besar
+    return buat_sampel_strata(_data)
+
+@st.cache_resource
+def executor_eksak():
+    # Thread pool bersama untuk menghitung jawaban eksak di background
+    return ThreadPoolExecutor(max_workers=2)
+
+@st.fragment(run_every=1)
+def tunggu_hasil_eksak(future):
+    # Cek tiap detik; begitu hasil eksak siap, rerun seluruh app supaya estimasi diganti
+    if future.done():
+        st.rerun()
+    st.caption("⏳ Menghitung jawaban eksak di background...")
+
+@st.cache_resource(show_spinner="Menyiapkan file kolumnar (Parquet)...")
+def parquet_penjualan(path_csv, mtime, versi):
+    # dibangun sekali per versi CSV, dipakai bersama semua sesi
+    path_parquet = siapkan_parquet(path_csv)
+    return path_parquet, buka_koneksi(path_parquet)
+
+@st.cache_data(max_entries=100, ttl=3600, show_spinner="Menjalankan query...")
+def hasil_query(sql, batas, path_csv, mtime, versi):
+    # hasil query di-cache per (query, batas, versi data); tiap query pakai cursor sendiri
+    _, con = parquet_penjualan(path_csv, mtime, versi)
+    return jalankan_query(con.cursor(), sql, batas)
+
 # ==========================================
 # KONFIGURASI HALAMAN & DATA LOAD
 # ==========================================
@@ -92,37 +241,37 @@ st.set_page_config(layout="wide", page_title="Nike Analytics Suite")
 st.title("Dashboard Analisis Product Nike")
 
 # Load Data Historis
-try:
-    df = pd.read_csv("data_hasil_scrapping.csv")
-except:
+sumber_data, mtime, laporan_kualitas = None, 0, {}
+versi = versi_sumber()
+for path_csv in ["data_hasil_scrapping.csv", "dataset keggle/data_hasil_scrapping.csv"]:
+    if os.path.exists(path_csv):
+        sumber_data, mtime = path_csv, os.path.getmtime(path_csv)
+        break
+
+# Data Cleaning (validasi + deduplikasi, hasilnya di-cache per versi file)
+if sumber_data is None:
+    st.error("File CSV tidak ditemukan.")
+    df = pd.DataFrame()
+else:
     try:
-        df = pd.read_csv("dataset keggle/data_hasil_scrapping.csv")
-    except:
-        st.error("File CSV tidak ditemukan.")
+        df, laporan_kualitas = muat_data(sumber_data, mtime, versi)
+    except Exception as e:
+        # file ada tapi gagal dibaca/divalidasi: tampilkan error aslinya
+        st.error(f"Gagal memuat '{sumber_data}': {e}")
+        st.exception(e)
         df = pd.DataFrame()
 
-# Data Cleaning
-
 if not df.empty:
-    df["Invoice Date"] = pd.to_datetime(
-        df["Invoice Date"],
-        format="%d-%m-%Y",
-        errors="coerce"
-    )
-
-    # Hitung Kurs
-    kurs = 16900
-    if "Total Sales" in df.columns:
-        df["Total Sales IDR"] = df["Total Sales"] * kurs
-    if "Price per Unit" in df.columns:
-        df["price per unit IDR"] = df["Price per Unit"] * kurs
-
-    # Kategori
-    if "Units Sold" in df.columns:
-        df["kategori"] = df["Units Sold"].apply(
-            lambda x: "Kurang Laku" if x < 50 else "Laku" if x <= 80 else "Sangat Laku" 
+    # Tanggal yang tidak valid tidak lagi diabaikan diam-diam
+    if laporan_kualitas.get("tanggal_tidak_valid"):
+        st.warning(
+            f"{laporan_kualitas['tanggal_tidak_valid']:,} baris punya Invoice Date tidak valid "
+            "(lihat Laporan Kualitas Data)."
         )
 
+    # Kolom IDR & kategori sudah dihitung di muat_data
+    kurs = KURS_IDR
+
 # ==========================================
 # BAGIAN 1: LIVE SCRAPER PANEL
 # ==========================================
@@ -176,6 +325,14 @@ with st.expander("Buka Panel Scrapping", expanded=False):
 st.divider()
 st.subheader("🧑‍💻 Analisis Data Nike Keggle.com")
 
+if laporan_kualitas:
+    with st.expander("🧪 Laporan Kualitas Data", expanded=False):
+        q1, q2, q3 = st.columns(3)
+        q1.metric("Baris Valid", f"{laporan_kualitas['jumlah_baris_akhir']:,}")
+        q2.metric("Duplikat Dihapus", f"{laporan_kualitas['duplikat_dalam_batch']:,}")
+        q3.metric("Tanggal Tidak Valid", f"{laporan_kualitas.get('tanggal_tidak_valid', 0):,}")
+        st.json(laporan_kualitas)
+
 with st.expander("Panel Cari Produk", expanded=False):
     
     # --- FITUR SEARCH DENGAN BUTTON ---
@@ -197,19 +354,65 @@ with st.expander("Panel Cari Produk", expanded=False):
 # Inisialisasi DataFrame untuk ditampilkan
 if not df.empty:
 
-    df_display = df.copy()
+    # =========================
+    # MODE CEPAT (SAMPLING)
+    # =========================
+    with st.sidebar:
+        st.subheader("⚡ Mode Cepat")
+        mode_cepat = st.toggle(
+            "Gunakan sampling berstrata",
+            value=len(df) >= BATAS_MODE_CEPAT,
+            help="Top Produk, Wilayah dan Peta ditaksir dari sampel per Region x Product (CI 95%)."
+        )
+
+    if mode_cepat:
+        sampel = sampel_data(df, (sumber_data, mtime, versi, len(df)))
+
+        # jawaban eksak yang diminta user disimpan per kata kunci
+        kunci_eksak = (sumber_data, mtime, versi, query_historis)
+        hasil_eksak = st.session_state.setdefault("hasil_eksak", {})
+        future = hasil_eksak.get(kunci_eksak)
+
+        if future is not None and future.done() and future.exception() is not None:
+            # hitungan eksak gagal: tampilkan error, buang future-nya, kembali ke estimasi
+            st.error(f"Hitung eksak gagal: {future.exception()}")
+            hasil_eksak.pop(kunci_eksak, None)
+            future = None
+
+        if future is not None and future.done():
+            agg = future.result()
+        else:
+            agg = hitung_agregat_sampel(sampel, query_historis, kurs)
+
+            with st.sidebar:
+                st.caption(f"Estimasi dari {len(sampel):,} dari {len(df):,} baris.")
+                if future is None:
+                    if st.button("🎯 Hitung Eksak", use_container_width=True):
+                        hasil_eksak[kunci_eksak] = executor_eksak().submit(
+                            hitung_agregat, df, query_historis
+                        )
+                        st.rerun()
+                else:
+                    tunggu_hasil_eksak(future)
+
+        if query_historis:
+            df_display = sampel[cocok_produk(sampel["Product"], query_historis)].drop(columns=["_N", "_n"])
+        else:
+            df_display = sampel.drop(columns=["_N", "_n"])
+    else:
+        agg = hitung_agregat(df, query_historis)
+
+        if query_historis:
+            df_display = df[cocok_produk(df["Product"], query_historis)]
+        else:
+            df_display = df.copy()
 
-    # filter kalau ada keyword
     if query_historis:
-        mask = (
-            df["Product"]
-            .astype(str)
-            .str.lower()
-            .str.contains(query_historis.lower(), na=False)
-        )
-        df_display = df[mask]
+        perkiraan = "" if agg["eksak"] else "sekitar "
+        st.info(f"Ditemukan {perkiraan}**{agg['baris']:,}** data untuk kata kunci: '{query_historis}'")
 
-        st.info(f"Ditemukan **{len(df_display)}** data untuk kata kunci: '{query_historis}'")
+    if not agg["eksak"]:
+        st.caption("⚡ Mode cepat: angka di bawah adalah estimasi (± = selang kepercayaan 95%).")
 
     # =========================
     # TABS SELALU TAMPIL (LUAR IF)
@@ -224,7 +427,10 @@ if not df.empty:
 
     # 1. Overview
     with tab_overview:
-            st.write(f"Menampilkan **{df_display.shape[0]}** baris data.")
+            if mode_cepat:
+                st.write(f"Menampilkan **{df_display.shape[0]}** baris sampel.")
+            else:
+                st.write(f"Menampilkan **{df_display.shape[0]}** baris data.")
             st.dataframe(
                 df_display, 
                 use_container_width=True,
@@ -234,29 +440,24 @@ if not df.empty:
         # 2. Top Produk
     with tab_top:
             st.markdown("#### Top Produk Berdasarkan Kategori")
-            produk_total = (
-                df_display.groupby("Product")["Units Sold"]
-                .sum().sort_values(ascending=False).reset_index()
-            )
+            produk_total = agg["produk"]
             if not produk_total.empty:
-                n = len(produk_total)
-                bagi = max(1, n // 3)
-                c_top1, c_top2, c_top3 = st.columns(3)
-                with c_top1:
-                    st.success("🔥 **Sangat Laku**")
-                    st.dataframe(produk_total.iloc[:bagi], use_container_width=True, hide_index=True)
-                with c_top2:
-                    st.warning("👍 **Laku**")
-                    st.dataframe(produk_total.iloc[bagi:bagi*2], use_container_width=True, hide_index=True)
-                with c_top3:
-                    st.error("❄️ **Kurang Laku**")
-                    st.dataframe(produk_total.iloc[bagi*2:], use_container_width=True, hide_index=True)
+                # tiap tier hanya mengirim top baris ke browser (lihat BATAS_TAMPIL)
+                tiers = tier_produk(produk_total, "Units Sold")
+                kotak = [st.success, st.warning, st.error]
+                ikon = ["🔥", "👍", "❄️"]
+                for kolom, tampil, simbol, (nama, tabel, jumlah) in zip(st.columns(3), kotak, ikon, tiers):
+                    with kolom:
+                        tampil(f"{simbol} **{nama}**")
+                        st.dataframe(tabel, use_container_width=True, hide_index=True)
+                        if jumlah > len(tabel):
+                            st.caption(f"Menampilkan {len(tabel):,} teratas dari {jumlah:,} produk.")
 
         # 3. Analisis Wilayah
     with tab_region:
             st.markdown("#### Performa Penjualan Regional")
-            if not df_display.empty:
-                regional_perf = df_display.groupby('Region')['Total Sales'].sum().sort_values(ascending=True)
+            if agg["baris"] > 0:
+                regional_perf = agg["wilayah"].set_index("Region")["Total Sales"].sort_values(ascending=True)
                 rc1, rc2 = st.columns([2, 1])
                 with rc1:
                     fig_reg, ax_reg = plt.subplots(figsize=(8, 4))
@@ -264,23 +465,17 @@ if not df.empty:
                     regional_perf.plot(kind='barh', color=colors, ax=ax_reg)
                     st.pyplot(fig_reg)
                 with rc2:
-                    st.metric("Total Sales (USD)", f"${df_display['Total Sales'].sum():,.0f}")
-                    st.metric("Total Sales (IDR)", f"Rp {df_display['Total Sales IDR'].sum():,.0f}")
+                    st.metric("Total Sales (USD)", f"${agg['total_sales']:,.0f}")
+                    if not agg["eksak"]:
+                        st.caption(f"± ${agg['total_sales_ci']:,.0f} (CI 95%)")
+                    st.metric("Total Sales (IDR)", f"Rp {agg['total_sales'] * kurs:,.0f}")
+                    if not agg["eksak"]:
+                        st.caption(f"± Rp {agg['total_sales_ci'] * kurs:,.0f} (CI 95%)")
 
             show_table = st.checkbox("📋 Tampilkan tabel detail per wilayah")
 
             if show_table:
-                regional_table = (
-                df_display
-                .groupby("Region")
-                .agg({
-                    "Units Sold": "sum",
-                    "Total Sales": "sum",
-                    "Total Sales IDR": "sum"
-                })
-                .reset_index()
-                .sort_values("Total Sales", ascending=False)
-            )
+                regional_table = agg["wilayah"].sort_values("Total Sales", ascending=False)
 
                 st.dataframe(regional_table, use_container_width=True)
 
@@ -292,12 +487,9 @@ if not df.empty:
 
         st.markdown("#### 📍 Peta Sebaran Penjualan USA")
 
-        if not df_display.empty:
+        if agg["baris"] > 0:
 
-            state_stats = df_display.groupby('State').agg({
-                'Units Sold': 'sum',
-                'Total Sales': 'sum'
-            }).reset_index()
+            state_stats = agg["state"]
 
             # ===============================
             # MAP BASE
@@ -313,13 +505,7 @@ if not df.empty:
             # ===============================
             # REGION POLYGON (rapih + soft color)
             # ===============================
-            regions = [
-                {"name": "West", "coords": [[49,-125],[49,-111],[31,-111],[31,-125]], "color":"#2ecc71"},
-                {"name": "Midwest", "coords": [[49,-111],[49,-82],[37,-82],[37,-111]], "color":"#3498db"},
-                {"name": "Northeast", "coords": [[47.5,-82],[47.5,-67],[38,-67],[38,-82]], "color":"#9b59b6"},
-                {"name": "Southwest", "coords": [[42,-111],[42,-94],[25.5,-94],[31,-111]], "color":"#f39c12"},
-                {"name": "Southeast", "coords": [[37,-94],[38,-75],[24,-80],[24,-94]], "color":"#e74c3c"},
-            ]
+            regions = REGIONS
 
             for reg in regions:
                 folium.Polygon(
@@ -335,16 +521,7 @@ if not df.empty:
             # ===============================
             # KOORDINAT STATE
             # ===============================
-            selected_State_Coords = {
-                "California":[36.77,-119.41],"Texas":[31.96,-99.90],"New York":[43.29,-74.21],
-                "Illinois":[40.63,-89.39],"Pennsylvania":[41.20,-77.19],"Nevada":[38.80,-116.41],
-                "Colorado":[39.55,-105.78],"Washington":[47.75,-120.74],"Florida":[27.99,-81.76],
-                "Minnesota":[46.72,-94.68],"Montana":[46.87,-110.36],"Tennessee":[35.51,-86.58],
-                "Louisiana":[30.98,-91.96],"Virginia":[37.43,-78.65],"Oregon":[43.80,-120.55],
-                "Utah":[39.32,-111.09],"Iowa":[41.87,-93.09],"Michigan":[44.18,-84.50],
-                "Missouri":[38.57,-92.60],"Ohio":[40.41,-82.90],"Georgia":[32.16,-82.90],
-                "Arizona":[34.04,-111.09],"Kansas":[39.01,-98.48]
-            }
+            selected_State_Coords = STATE_COORDS
 
             # ===============================
             # MARKER (card popup seperti gambar 2)
@@ -358,6 +535,10 @@ if not df.empty:
                     units = row["Units Sold"]
                     sales = row["Total Sales"]
 
+                    # di mode cepat tampilkan juga selang kepercayaan
+                    ci_units = f" ± {row['± CI Units Sold']:,.0f}" if not agg["eksak"] else ""
+                    ci_sales = f" ± ${row['± CI Total Sales']:,.0f}" if not agg["eksak"] else ""
+
                     popup_html = f"""
                     <div style="
                         font-family: Arial;
@@ -367,8 +548,8 @@ if not df.empty:
                         <h4 style="margin-bottom:6px;color:#e74c3c;">
                             {s_name}
                         </h4>
-                        <b>Units Sold:</b> {units:,.0f}<br>
-                        <b>Revenue:</b> ${sales:,.0f}
+                        <b>Units Sold:</b> {units:,.0f}{ci_units}<br>
+                        <b>Revenue:</b> ${sales:,.0f}{ci_sales}
                     </div>
                     """
 
@@ -383,8 +564,60 @@ if not df.empty:
                         )
                     ).add_to(m)
 
+            # ===============================
+            # TITIK TOKO (kalau data punya koordinat)
+            # ===============================
+            if {"Latitude", "Longitude"}.issubset(df_display.columns):
+                titik = petakan_titik(df_display.dropna(subset=["Latitude", "Longitude"]))
+                FastMarkerCluster(titik[["Latitude", "Longitude"]].to_numpy().tolist()).add_to(m)
+                st.caption(
+                    f"{len(titik):,} titik toko; per region peta (perkiraan dari polygon yang disederhanakan): "
+                    + ", ".join(f"{r} {c:,}" for r, c in titik["Region Peta"].value_counts(dropna=False).items())
+                )
+
             st_folium(m, width="100%", height=650)
 
         else:
             st.info("Tidak ada data untuk ditampilkan.")
 
+# ==========================================
+# BAGIAN 3: QUERY SQL AD-HOC
+# ==========================================
+st.divider()
+st.subheader("🧮 Query SQL Ad-hoc")
+st.caption("Breakdown bebas langsung dari file kolumnar, tanpa memuat semua data ke pandas.")
+
+if sumber_data:
+    with st.expander("Panel Query SQL", expanded=False):
+        st.caption(
+            "Tabel: `penjualan` (kolom sama dengan dataset, nama berspasi pakai tanda kutip ganda, "
+            "mis. `\"Total Sales\"`). Hanya query SELECT."
+        )
+        sql_input = st.text_area("Query SQL", value=CONTOH_QUERY, height=220, key="input_sql")
+
+        c_sql1, c_sql2 = st.columns([3, 1])
+        with c_sql1:
+            batas_baris = st.number_input("Maks baris ditampilkan", 100, 100_000, BATAS_BARIS, step=100)
+        with c_sql2:
+            st.write("")
+            st.write("")
+            if st.button("▶️ Jalankan Query", use_container_width=True):
+                st.session_state["sql_terakhir"] = sql_input
+
+        # query terakhir tetap tampil saat widget lain memicu rerun (hasilnya dari cache)
+        sql_terakhir = st.session_state.get("sql_terakhir")
+        if sql_terakhir:
+            try:
+                hasil_sql, terpotong = hasil_query(sql_terakhir, int(batas_baris), sumber_data, mtime, versi)
+            except QueryTidakValid as e:
+                st.warning(str(e))
+            except duckdb.Error as e:
+                st.error(f"Query gagal: {e}")
+            else:
+                st.dataframe(hasil_sql, use_container_width=True)
+                if terpotong:
+                    st.caption(f"Hasil dipotong: hanya {len(hasil_sql):,} baris pertama yang ditampilkan.")
+                csv_sql = hasil_sql.to_csv(index=False).encode("utf-8")
+                st.download_button("Download Hasil (CSV)", csv_sql, "hasil_query.csv", "text/csv")
+else:
+    st.info("File CSV tidak ditemukan, query SQL tidak tersedia.")
@@ -0,0 +1,322 @@
+# ==========================================
+# GEOMETRI WILAYAH & INDEKS SPASIAL
+# ==========================================
+# Satu-satunya sumber polygon region, polygon & koordinat state untuk
+# gis.py dan dashboard utama, plus indeks grid (bounding-box) untuk menentukan
+# region/state dari banyak titik lat/lon (mis. lokasi toko) sekaligus
+# dengan uji point-in-polygon yang di-vektorkan.
+import numpy as np
+import pandas as pd
+
+# Polygon region di peta. "region_data" adalah nama Region di dataset
+# (polygon Southwest mewakili Region "South" di data penjualan).
+# Kalau polygon tumpang tindih, polygon yang lebih dulu di list menang.
+REGIONS = [
+    {"name": "West", "region_data": "West", "coords": [[49, -125], [49, -111], [31, -111], [31, -125]], "color": "#2ecc71"},
+    {"name": "Midwest", "region_data": "Midwest", "coords": [[49, -111], [49, -82], [37, -82], [37, -111]], "color": "#3498db"},
+    {"name": "Northeast", "region_data": "Northeast", "coords": [[47.5, -82], [47.5, -67], [38, -67], [38, -82]], "color": "#9b59b6"},
+    {"name": "Southwest", "region_data": "South", "coords": [[42, -111], [42, -94], [25.5, -94], [31, -111]], "color": "#f39c12"},
+    {"name": "Southeast", "region_data": "Southeast", "coords": [[37, -94], [38, -75], [24, -80], [24, -94]], "color": "#e74c3c"},
+]
+
+# Titik tengah tiap state yang ada di dataset
+STATE_COORDS = {
+    "California": [36.7783, -119.4179], "Texas": [31.9686, -99.9018],
+    "New York": [43.2994, -74.2179], "Illinois": [40.6331, -89.3985],
+    "Pennsylvania": [41.2033, -77.1945], "Nevada": [38.8026, -116.4194],
+    "Colorado": [39.5501, -105.7821], "Washington": [47.7511, -120.7401],
+    "Florida": [27.9944, -81.7603], "Minnesota": [46.7296, -94.6859],
+    "Montana": [46.8797, -110.3626], "Tennessee": [35.5175, -86.5804],
+    "Louisiana": [30.9843, -91.9623], "Virginia": [37.4316, -78.6569],
+    "Wyoming": [43.07597, -107.2903], "Oregon": [43.8041, -120.5542],
+    "Utah": [39.3200, -111.0937], "Iowa": [41.8780, -93.0977],
+    "Michigan": [44.1822, -84.5068], "Missouri": [38.5739, -92.6038],
+    "North Dakota": [47.5515, -101.0020], "Indiana": [40.2672, -86.1349],
+    "Wisconsin": [44.5000, -89.5000], "Massachusetts": [42.4072, -71.3824],
+    "New Hampshire": [43.1939, -71.5724], "Vermont": [44.0000, -72.6999],
+    "Connecticut": [41.6032, -73.0877], "Delaware": [38.9108, -75.5277],
+    "Maryland": [39.0458, -76.6413], "Rhode Island": [41.5801, -71.4774],
+    "West Virginia": [38.5976, -80.4549], "New Jersey": [40.0583, -74.4057],
+    "Maine": [45.2538, -69.4455], "Georgia": [32.1656, -82.9001],
+    "Arizona": [34.0489, -111.0937], "Idaho": [44.0682, -114.7420],
+    "New Mexico": [34.5199, -105.8701], "Ohio": [40.4173, -82.9071],
+    "Kansas": [39.0119, -98.4842], "Nebraska": [41.4925, -99.9018],
+    "South Dakota": [43.9695, -99.9018], "Alabama": [32.8067, -86.7911],
+    "Mississippi": [32.3547, -89.3985], "Kentucky": [37.8393, -84.2700],
+    "North Carolina": [35.7596, -79.0193], "South Carolina": [33.8361, -81.1637],
+    "Oklahoma": [35.0078, -97.0929], "Arkansas": [34.9697, -92.3731],
+}
+
+# Batas state yang disederhanakan (beberapa belas titik per state, akurasi
+# kira-kira 10-30 km) untuk menentukan state dari titik lat/lon.
+# Michigan (semenanjung atas dan bawah) dan Florida (plus Keys) terdiri dari dua polygon.
+STATE_POLYGONS = {
+    "Washington": [[[49, -124.7], [49, -117.03], [46, -117.03], [46, -118.98], [45.6, -121.2], [45.6, -122.8], [46.25, -124.05], [47.9, -124.7]]],
+    "Oregon": [[[46.25, -124.05], [45.6, -122.8], [45.6, -121.2], [46, -118.98], [46, -116.92], [45.6, -116.46], [44.3, -117.2], [43.6, -116.98], [42, -117.03], [42, -124.25], [43, -124.55], [46, -123.95]]],
+    "California": [[[42, -124.25], [42, -120], [39, -120], [35, -114.63], [34.3, -114.13], [32.72, -114.72], [32.53, -117.12], [34, -118.5], [34.45, -120.45], [36.3, -121.9], [37.8, -122.5], [38.9, -123.7], [40.4, -124.4], [41.7, -124.2]]],
+    "Nevada": [[[42, -120], [42, -114.04], [36.2, -114.04], [36, -114.74], [35, -114.63], [39, -120]]],
+    "Idaho": [[[49, -117.03], [49, -116.05], [48, -116.05], [46.6, -114.35], [45.55, -114.5], [44.45, -112.4], [44.5, -111.05], [42, -111.05], [42, -117.03], [43.6, -116.98], [44.3, -117.2], [45.6, -116.46], [46, -116.92], [46, -117.03]]],
+    "Montana": [[[49, -116.05], [49, -104.05], [45, -104.05], [45, -111.05], [44.5, -111.05], [44.45, -112.4], [45.55, -114.5], [46.6, -114.35], [48, -116.05]]],
+    "Wyoming": [[[45, -111.05], [45, -104.05], [41, -104.05], [41, -111.05]]],
+    "Utah": [[[42, -114.04], [42, -111.05], [41, -111.05], [41, -109.05], [37, -109.05], [37, -114.04]]],
+    "Colorado": [[[41, -109.05], [41, -102.05], [37, -102.05], [37, -109.05]]],
+    "Arizona": [[[37, -114.04], [37, -109.05], [31.33, -109.05], [31.33, -111.07], [32.49, -114.81], [32.72, -114.72], [34.3, -114.13], [35, -114.63], [36, -114.74], [36.2, -114.04]]],
+    "New Mexico": [[[37, -109.05], [37, -103], [32, -103.06], [32, -106.62], [31.78, -106.53], [31.78, -108.21], [31.33, -108.21], [31.33, -109.05]]],
+    "North Dakota": [[[49, -104.05], [49, -97.23], [45.94, -96.56], [45.94, -104.05]]],
+    "South Dakota": [[[45.94, -104.05], [45.94, -96.56], [45.3, -96.45], [43.5, -96.45], [42.5, -96.6], [42.8, -97.9], [43, -98.5], [43, -104.05]]],
+    "Nebraska": [[[43, -104.05], [43, -98.5], [42.8, -97.9], [42.5, -96.6], [41.5, -96], [40, -95.31], [40, -102.05], [41, -102.05], [41, -104.05]]],
+    "Kansas": [[[40, -102.05], [40, -95.31], [39.1, -94.6], [37, -94.62], [37, -102.05]]],
+    "Oklahoma": [[[37, -103], [37, -94.62], [36.5, -94.62], [35.4, -94.43], [33.64, -94.48], [33.9, -95.5], [33.85, -97], [34.2, -98.2], [34.56, -100], [36.5, -100], [36.5, -103]]],
+    "Texas": [[[36.5, -103], [36.5, -100], [34.56, -100], [34.2, -98.2], [33.85, -97], [33.9, -95.5], [33.64, -94.48], [33.02, -94.04], [31.99, -94.04], [29.7, -93.84], [29.3, -94.7], [28, -97], [26, -97.15], [25.84, -97.4], [26.4, -99.1], [27.5, -99.5], [29.8, -101.4], [29, -103.1], [29.7, -104.5], [31.78, -106.53], [32, -106.62], [32, -103.06]]],
+    "Louisiana": [[[33.02, -94.04], [33, -91.17], [31, -91.63], [31, -89.73], [30.18, -89.6], [29, -89], [29.1, -90.5], [29.55, -92.3], [29.7, -93.84], [31.99, -94.04]]],
+    "Arkansas": [[[36.5, -94.62], [36.5, -90.15], [35, -90.1], [34, -91.1], [33, -91.17], [33.02, -94.04], [33.64, -94.48], [35.4, -94.43]]],
+    "Missouri": [[[40.6, -95.77], [40.6, -91.42], [39.7, -91.37], [38.8, -90.12], [37, -89.15], [36.5, -89.5], [36, -89.7], [36, -90.37], [36.5, -90.15], [36.5, -94.62], [37, -94.62], [39.1, -94.6], [40, -95.31]]],
+    "Iowa": [[[43.5, -96.45], [43.5, -91.22], [42.5, -90.64], [41.5, -90.4], [40.6, -91.42], [40.6, -95.77], [41.5, -96], [42.5, -96.6]]],
+    "Minnesota": [[[49, -97.23], [49, -95.15], [48.6, -93], [48.1, -89.6], [46.75, -92.05], [46.65, -92.25], [46.1, -92.3], [45.4, -92.75], [44.7, -92.8], [43.5, -91.22], [43.5, -96.45], [45.3, -96.45], [45.94, -96.56]]],
+    "Wisconsin": [[[46.75, -92.05], [46.95, -90.4], [46.5, -90], [45.9, -88.1], [45.3, -87.6], [44.9, -87.4], [43.5, -87.8], [42.5, -87.8], [42.5, -90.64], [43.5, -91.22], [44.7, -92.8], [45.4, -92.75], [46.1, -92.3], [46.65, -92.25]]],
+    "Illinois": [[[42.5, -90.64], [42.5, -87.8], [41.7, -87.53], [39, -87.53], [38, -88], [37, -88.1], [37, -89.15], [38.8, -90.12], [39.7, -91.37], [40.6, -91.42], [41.5, -90.4]]],
+    "Michigan": [
+        [[41.7, -86.8], [41.7, -83.45], [42.3, -83.1], [43, -82.4], [44, -82.6], [45, -83.4], [45.8, -84.7], [45.8, -85], [45, -85.6], [44, -86.5], [43, -86.25], [42, -86.6]],
+        [[46.95, -90.4], [47.4, -89], [47.5, -87.8], [46.5, -84.6], [45.95, -83.9], [46.1, -85.5], [45.8, -86.5], [45.3, -87.6], [45.9, -88.1], [46.5, -90]],
+    ],
+    "Indiana": [[[41.76, -87.53], [41.76, -84.8], [39.1, -84.82], [38.8, -85], [38.3, -85.8], [38, -86], [37.8, -87.9], [38, -88], [39, -87.53]]],
+    "Ohio": [[[41.7, -84.8], [41.7, -83.45], [41.45, -82.7], [41.5, -81.7], [41.98, -80.52], [40.64, -80.52], [40, -80.73], [39.4, -81.6], [38.6, -82.6], [38.8, -83.7], [39.1, -84.82]]],
+    "Kentucky": [[[39.1, -84.82], [38.8, -83.7], [38.6, -82.6], [38.2, -82.6], [37.55, -81.97], [36.6, -83.67], [36.6, -88.05], [36.5, -88.05], [36.5, -89.5], [37, -89.15], [37, -88.1], [38, -88], [37.8, -87.9], [38, -86], [38.3, -85.8], [38.8, -85]]],
+    "Tennessee": [[[36.6, -88.05], [36.6, -83.67], [36.6, -81.68], [35, -84.32], [35, -90.3], [36, -89.7], [36.5, -89.5], [36.5, -88.05]]],
+    "Mississippi": [[[35, -90.3], [35, -88.2], [31, -88.43], [30.4, -88.4], [30.18, -89.6], [31, -89.73], [31, -91.63], [33, -91.17], [34, -91.1], [35, -90.1]]],
+    "Alabama": [[[35, -88.2], [35, -85.6], [32.9, -85.18], [32, -85], [31, -85], [31, -87.6], [30.25, -87.5], [30.4, -88.4], [31, -88.43]]],
+    "Georgia": [[[35, -85.6], [35, -83.1], [34, -82.2], [33, -81.6], [32.05, -80.85], [30.7, -81.45], [30.55, -82], [30.7, -84.86], [31, -85], [32, -85], [32.9, -85.18]]],
+    "Florida": [
+        [[31, -87.6], [31, -85], [30.7, -84.86], [30.55, -82], [30.7, -81.45], [29, -80.9], [27, -80.05], [25.2, -80.3], [25.1, -81.1], [26.5, -82.1], [28, -82.8], [29.1, -83.1], [30, -84.3], [29.7, -85.4], [30.25, -87.5]],
+        [[25.3, -80.25], [25.1, -80.35], [24.45, -81.75], [24.5, -81.9]],
+    ],
+    "South Carolina": [[[35, -83.1], [35.2, -82.4], [35.15, -81.05], [34.8, -80.8], [34.8, -79.7], [33.85, -78.55], [32.8, -79.9], [32.05, -80.85], [33, -81.6], [34, -82.2]]],
+    "North Carolina": [[[36.55, -81.68], [36.55, -75.87], [35.2, -75.5], [34.7, -76.5], [34.3, -77.8], [33.85, -78.55], [34.8, -79.7], [34.8, -80.8], [35.15, -81.05], [35.2, -82.4], [35, -83.1], [35, -84.32]]],
+    "Virginia": [[[39.45, -77.8], [38.9, -77.05], [38.4, -77.2], [38, -76.3], [37, -76], [36.55, -75.87], [36.55, -81.68], [36.6, -83.67], [37.55, -81.97], [37.3, -81], [38, -80], [38.9, -78.4]]],
+    "West Virginia": [[[40.64, -80.52], [39.72, -80.52], [39.72, -79.48], [39.2, -79.48], [39.7, -78.2], [39.45, -77.8], [38.9, -78.4], [38, -80], [37.3, -81], [37.55, -81.97], [38.2, -82.6], [38.6, -82.6], [39.4, -81.6], [40, -80.73]]],
+    "Delaware": [[[39.84, -75.79], [39.84, -75.4], [39.5, -75.5], [38.8, -75.05], [38.45, -75.05], [38.46, -75.7], [39.72, -75.79]]],
+    "Maryland": [[[39.72, -79.48], [39.72, -75.79], [38.46, -75.7], [38.45, -75.05], [38.03, -75.24], [38, -76.3], [38.4, -77.2], [38.9, -77.05], [39.45, -77.8], [39.7, -78.2], [39.2, -79.48]]],
+    "Pennsylvania": [[[42.27, -80.52], [42, -79.76], [42, -75.36], [41.35, -74.7], [40.6, -75.2], [40.2, -74.75], [39.95, -75.12], [39.84, -75.4], [39.72, -75.79], [39.72, -80.52]]],
+    "New Jersey": [[[41.35, -74.7], [41, -73.9], [40.7, -74.03], [40.5, -74.25], [40.45, -74], [40, -74.05], [39, -74.8], [38.93, -74.96], [39.5, -75.5], [39.84, -75.4], [39.95, -75.12], [40.2, -74.75], [40.6, -75.2]]],
+    "Connecticut": [[[42.05, -73.5], [42.02, -71.8], [41.3, -71.85], [41.3, -72.5], [41, -73.65], [41.1, -73.7]]],
+    "Rhode Island": [[[42.02, -71.8], [42.02, -71.38], [41.5, -71.1], [41.3, -71.85]]],
+    "New York": [[[45, -74.75], [45, -73.35], [42.75, -73.26], [42.05, -73.5], [41.1, -73.7], [41.15, -71.85], [40.55, -73.9], [40.5, -74.25], [41, -73.9], [41.35, -74.7], [42, -75.36], [42, -79.76], [42.5, -79.76], [43.3, -79.05], [43.3, -77], [43.6, -76.2], [44.2, -76.3]]],
+    "Massachusetts": [[[42.75, -73.26], [42.7, -71.3], [42.87, -70.82], [42, -70.6], [42.05, -70], [41.55, -69.95], [41.5, -71.1], [42.02, -71.38], [42.02, -71.8], [42.05, -73.5]]],
+    "Vermont": [[[45, -73.35], [45, -71.5], [44, -72.1], [43, -72.45], [42.73, -72.46], [42.75, -73.26], [43.6, -73.3]]],
+    "New Hampshire": [[[45.3, -71.1], [43.1, -70.7], [42.87, -70.82], [42.7, -71.3], [42.73, -72.46], [43, -72.45], [44, -72.1], [45, -71.5]]],
+    "Maine": [[[47.46, -69.2], [47.35, -68.3], [47.1, -67.8], [45.9, -67.8], [45.1, -67.1], [44.3, -68], [43.6, -70.2], [43.1, -70.7], [45.3, -71.1], [46.4, -70]]],
+}
+
+# titik di luar semua polygon (mis. pantai yang terpotong penyederhanaan)
+# masih diberi state terdekat kalau jaraknya ke batas state paling jauh ini (derajat)
+TOLERANSI_STATE = 0.25
+
+# Region tiap state sesuai kolom Region di dataset
+STATE_REGION = {
+    **dict.fromkeys([
+        "Illinois", "Minnesota", "Montana", "Iowa", "Michigan", "Missouri", "North Dakota",
+        "Indiana", "Wisconsin", "Ohio", "Kansas", "Nebraska", "South Dakota",
+    ], "Midwest"),
+    **dict.fromkeys([
+        "New York", "Pennsylvania", "Massachusetts", "New Hampshire", "Vermont", "Connecticut",
+        "Delaware", "Maryland", "Rhode Island", "West Virginia", "New Jersey", "Maine",
+    ], "Northeast"),
+    **dict.fromkeys([
+        "Texas", "Tennessee", "Louisiana", "Alabama", "Mississippi", "Oklahoma", "Arkansas",
+    ], "South"),
+    **dict.fromkeys([
+        "Florida", "Virginia", "Georgia", "Kentucky", "North Carolina", "South Carolina",
+    ], "Southeast"),
+    **dict.fromkeys([
+        "California", "Nevada", "Colorado", "Washington", "Wyoming", "Oregon", "Utah",
+        "Arizona", "Idaho", "New Mexico",
+    ], "West"),
+}
+
+# status sel grid terhadap satu polygon
+LUAR, TEPI, PENUH = 0, 1, 2
+
+
+def titik_dalam_poligon(lat, lon, coords):
+    """Uji ray-casting untuk banyak titik sekaligus (loop hanya per sisi polygon)."""
+    lat = np.asarray(lat, dtype="float64")
+    lon = np.asarray(lon, dtype="float64")
+    poly = np.asarray(coords, dtype="float64")
+    y1, x1 = poly[:, 0], poly[:, 1]
+    y2, x2 = np.roll(y1, -1), np.roll(x1, -1)
+
+    dalam = np.zeros(lat.shape, dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for ya, xa, yb, xb in zip(y1, x1, y2, x2):
+            menyeberang = (ya > lat) != (yb > lat)
+            x_potong = (xb - xa) * (lat - ya) / (yb - ya) + xa
+            dalam ^= menyeberang & (lon < x_potong)
+    return dalam
+
+
+def _sisi_memotong_sel(xa, ya, xb, yb, xmin, xmax, ymin, ymax):
+    # Liang-Barsky: apakah segmen (xa,ya)-(xb,yb) menyentuh tiap kotak sel
+    t0 = np.zeros(xmin.shape)
+    t1 = np.ones(xmin.shape)
+    kena = np.ones(xmin.shape, dtype=bool)
+    dx, dy = xb - xa, yb - ya
+    for p, q in ((-dx, xa - xmin), (dx, xmax - xa), (-dy, ya - ymin), (dy, ymax - ya)):
+        if p == 0:
+            kena &= q >= 0
+        elif p < 0:
+            t0 = np.maximum(t0, q / p)
+        else:
+            t1 = np.minimum(t1, q / p)
+    return kena & (t0 <= t1)
+
+
+class IndeksSpasial:
+    """Indeks grid bounding-box untuk sekumpulan polygon.
+
+    Setiap sel grid ditandai per polygon sebagai LUAR, TEPI (dilewati
+    sisi polygon) atau PENUH (seluruh sel di dalam polygon). Titik di sel
+    PENUH langsung diberi polygon tanpa uji apa pun; hanya titik di sel
+    TEPI yang diuji point-in-polygon.
+    """
+
+    def __init__(self, polygons, ukuran_sel=1.0):
+        self.polygons = [np.asarray(p, dtype="float64") for p in polygons]
+        self.ukuran_sel = ukuran_sel
+
+        semua = np.vstack(self.polygons)
+        self.lat0, self.lon0 = semua[:, 0].min(), semua[:, 1].min()
+        self.ny = int(np.ceil((semua[:, 0].max() - self.lat0) / ukuran_sel)) or 1
+        self.nx = int(np.ceil((semua[:, 1].max() - self.lon0) / ukuran_sel)) or 1
+
+        iy, ix = np.divmod(np.arange(self.ny * self.nx), self.nx)
+        ymin = self.lat0 + iy * ukuran_sel
+        xmin = self.lon0 + ix * ukuran_sel
+        ymax, xmax = ymin + ukuran_sel, xmin + ukuran_sel
+
+        self.status = np.zeros((len(self.polygons), self.ny * self.nx), dtype="uint8")
+        for i, poly in enumerate(self.polygons):
+            tepi = np.zeros(self.ny * self.nx, dtype=bool)
+            for (ya, xa), (yb, xb) in zip(poly, np.roll(poly, -1, axis=0)):
+                tepi |= _sisi_memotong_sel(xa, ya, xb, yb, xmin, xmax, ymin, ymax)
+            # sel yang tidak dilewati sisi mana pun pasti seluruhnya di dalam atau di luar
+            tengah = titik_dalam_poligon(ymin + ukuran_sel / 2, xmin + ukuran_sel / 2, poly)
+            self.status[i] = np.where(tepi, TEPI, np.where(tengah, PENUH, LUAR))
+
+    def sel(self, lat, lon):
+        # indeks sel per titik, -1 untuk titik di luar bounding box grid
+        iy = np.floor((lat - self.lat0) / self.ukuran_sel)
+        ix = np.floor((lon - self.lon0) / self.ukuran_sel)
+        valid = (iy >= 0) & (iy < self.ny) & (ix >= 0) & (ix < self.nx)
+        return np.where(valid, iy * self.nx + ix, -1).astype("int64")
+
+    def cari(self, lat, lon):
+        """Indeks polygon pertama yang memuat tiap titik (-1 kalau tidak ada)."""
+        lat = np.asarray(lat, dtype="float64")
+        lon = np.asarray(lon, dtype="float64")
+        sel = self.sel(lat, lon)
+        hasil = np.full(lat.shape, -1, dtype="int64")
+        sisa = sel >= 0
+
+        for i, poly in enumerate(self.polygons):
+            if not sisa.any():
+                break
+            status = np.zeros(lat.shape, dtype="uint8")
+            status[sisa] = self.status[i, sel[sisa]]
+
+            penuh = status == PENUH
+            hasil[penuh] = i
+
+            idx_tepi = np.flatnonzero(status == TEPI)
+            if len(idx_tepi):
+                dalam = titik_dalam_poligon(lat[idx_tepi], lon[idx_tepi], poly)
+                hasil[idx_tepi[dalam]] = i
+
+            sisa &= hasil < 0
+        return hasil
+
+
+_INDEKS_REGION = None
+
+
+def indeks_region():
+    # indeks dibangun sekali lalu dipakai ulang
+    global _INDEKS_REGION
+    if _INDEKS_REGION is None:
+        _INDEKS_REGION = IndeksSpasial([r["coords"] for r in REGIONS])
+    return _INDEKS_REGION
+
+
+def tentukan_region(lat, lon):
+    """Nama Region (versi dataset) untuk tiap titik; None kalau di luar semua polygon."""
+    nama = np.array([r["region_data"] for r in REGIONS] + [None], dtype=object)
+    return nama[indeks_region().cari(lat, lon)]
+
+
+_INDEKS_STATE = None
+
+
+def indeks_state():
+    # indeks dibangun sekali; nama state per polygon disimpan berurutan
+    global _INDEKS_STATE
+    if _INDEKS_STATE is None:
+        nama = [s for s, polys in STATE_POLYGONS.items() for _ in polys]
+        _INDEKS_STATE = (IndeksSpasial([p for polys in STATE_POLYGONS.values() for p in polys]), nama)
+    return _INDEKS_STATE
+
+
+def _jarak_ke_sisi(lat, lon, poly):
+    # jarak terdekat (derajat, bujur diskalakan cos lintang) dari tiap titik ke sisi polygon
+    skala = np.cos(np.radians(lat))[:, None]
+    y1, x1 = poly[:, 0], poly[:, 1]
+    y2, x2 = np.roll(y1, -1), np.roll(x1, -1)
+    dy, dx = y2 - y1, (x2 - x1) * skala
+    py, px = lat[:, None] - y1, (lon[:, None] - x1) * skala
+    t = np.clip((px * dx + py * dy) / (dx * dx + dy * dy), 0, 1)
+    return np.hypot(px - t * dx, py - t * dy).min(axis=1)
+
+
+def tentukan_state(lat, lon, toleransi=TOLERANSI_STATE, ukuran_batch=20_000):
+    """Nama state per titik dari polygon batas state yang disederhanakan.
+
+    Titik di luar semua polygon diberi state dengan batas terdekat kalau
+    jaraknya tidak lebih dari ``toleransi`` derajat, selain itu None
+    (mis. titik di laut atau di luar AS). Karena batasnya disederhanakan,
+    titik yang sangat dekat perbatasan bisa masuk state tetangga.
+    """
+    lat = np.asarray(lat, dtype="float64")
+    lon = np.asarray(lon, dtype="float64")
+    indeks, nama = indeks_state()
+    nama = np.array(nama + [None], dtype=object)
+    idx = indeks.cari(lat, lon)
+
+    # hanya titik yang tidak masuk polygon mana pun dan berada di dekat
+    # bounding box suatu polygon yang dihitung jaraknya ke sisi polygon itu
+    luar = np.flatnonzero(idx < 0)
+    lat_luar, lon_luar = lat[luar], lon[luar]
+    terdekat = np.full(len(luar), np.inf)
+    for i, poly in enumerate(indeks.polygons):
+        (lat_min, lon_min), (lat_max, lon_max) = poly.min(axis=0), poly.max(axis=0)
+        # bujur diberi kelonggaran lebih karena jarak bujur diskalakan cos lintang
+        dekat = np.flatnonzero(
+            (lat_luar >= lat_min - toleransi) & (lat_luar <= lat_max + toleransi)
+            & (lon_luar >= lon_min - 2 * toleransi) & (lon_luar <= lon_max + 2 * toleransi)
+        )
+        for mulai in range(0, len(dekat), ukuran_batch):
+            bagian = dekat[mulai:mulai + ukuran_batch]
+            jarak = _jarak_ke_sisi(lat_luar[bagian], lon_luar[bagian], poly)
+            lebih_dekat = (jarak <= toleransi) & (jarak < terdekat[bagian])
+            terdekat[bagian[lebih_dekat]] = jarak[lebih_dekat]
+            idx[luar[bagian[lebih_dekat]]] = i
+    return nama[idx]
+
+
+def petakan_titik(df, kolom_lat="Latitude", kolom_lon="Longitude"):
+    # tambahkan kolom hasil pemetaan spasial; kolom asli DataFrame tidak ditimpa
+    lat = df[kolom_lat].to_numpy(dtype="float64")
+    lon = df[kolom_lon].to_numpy(dtype="float64")
+    state = tentukan_state(lat, lon)
+    return df.assign(**{
+        "Region Peta": tentukan_region(lat, lon),
+        "State Peta": state,
+        "Region State Peta": pd.Series(state, index=df.index).map(STATE_REGION),
+    })
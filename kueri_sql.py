@@ -0,0 +1,156 @@
+# ==========================================
+# QUERY SQL AD-HOC (DUCKDB + PARQUET)
+# ==========================================
+# Mesin SQL kolumnar in-process untuk breakdown bebas (Retailer x Sales
+# Method x bulan, band harga, dst) tanpa menulis groupby pandas baru.
+# CSV dikonversi sekali ke file Parquet di folder cache; DuckDB membaca
+# file itu langsung dengan predicate/projection pushdown dan scan paralel,
+# jadi data tidak perlu dimuat seluruhnya ke pandas.
+import hashlib
+import os
+import uuid
+
+import duckdb
+
+PATH_PARQUET = os.path.join("cache", "penjualan.parquet")
+
+# nama tabel yang dipakai di query
+NAMA_TABEL = "penjualan"
+
+# jumlah baris maksimum yang dikirim ke browser
+BATAS_BARIS = 10_000
+
+CONTOH_QUERY = """SELECT
+    Retailer,
+    "Sales Method",
+    date_trunc('month', "Invoice Date") AS bulan,
+    SUM("Units Sold") AS units,
+    SUM("Total Sales") AS total_sales
+FROM penjualan
+GROUP BY ALL
+ORDER BY bulan, total_sales DESC"""
+
+
+class QueryTidakValid(ValueError):
+    pass
+
+
+def identitas_sumber(path_csv):
+    # sidik CSV sumber (path + ukuran + waktu modifikasi), disimpan di metadata file Parquet
+    info = os.stat(path_csv)
+    teks = f"{os.path.abspath(path_csv)}|{info.st_size}|{info.st_mtime_ns}"
+    return hashlib.sha256(teks.encode("utf-8")).hexdigest()
+
+
+def _identitas_parquet(path_parquet):
+    try:
+        con = duckdb.connect()
+        try:
+            baris = con.execute(
+                "SELECT value::VARCHAR FROM parquet_kv_metadata(?) WHERE key::VARCHAR = 'sumber'",
+                [path_parquet],
+            ).fetchone()
+        finally:
+            con.close()
+    except duckdb.Error:
+        return None
+    return baris[0] if baris else None
+
+
+def siapkan_parquet(path_csv, path_parquet=PATH_PARQUET):
+    """Bangun cache Parquet dari CSV kalau belum ada atau dibuat dari sumber lain.
+
+    Sidik CSV sumber ikut ditulis ke metadata file Parquet, jadi cache tidak
+    dipakai ulang untuk CSV lain (atau versi lain) walaupun mtime-nya lebih tua.
+    """
+    sumber = identitas_sumber(path_csv)
+    if os.path.exists(path_parquet) and _identitas_parquet(path_parquet) == sumber:
+        return path_parquet
+
+    os.makedirs(os.path.dirname(path_parquet) or ".", exist_ok=True)
+    # nama file sementara unik per penulis, supaya beberapa proses/sesi yang
+    # membangun cache bersamaan tidak saling menimpa file setengah jadi
+    sementara = f"{path_parquet}.{os.getpid()}.{uuid.uuid4().hex}.part"
+
+    # konversi dijalankan DuckDB (tidak lewat pandas) dengan aturan yang sama
+    # seperti validasi_data: teks di-trim, State jadi title case, baris
+    # duplikat dibuang, dan tanggal diparse dengan format dataset
+    con = duckdb.connect()
+    try:
+        con.execute(f"""
+            COPY (
+                SELECT DISTINCT
+                    try_strptime(trim("Invoice Date"), '%d-%m-%Y')::DATE AS "Invoice Date",
+                    trim(Product) AS Product,
+                    trim(Region) AS Region,
+                    trim(Retailer) AS Retailer,
+                    trim("Sales Method") AS "Sales Method",
+                    array_to_string(
+                        list_transform(string_split(lower(trim(State)), ' '), s -> upper(s[1]) || s[2:]),
+                        ' '
+                    ) AS State,
+                    "Price per Unit",
+                    "Total Sales",
+                    "Units Sold"
+                FROM read_csv(?, header = true, all_varchar = false,
+                              types = {{'Invoice Date': 'VARCHAR'}})
+            ) TO '{sementara.replace("'", "''")}' (FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 122880,
+                 KV_METADATA {{sumber: '{sumber}'}})
+        """, [path_csv])
+    except BaseException:
+        # file setengah jadi milik penulis ini tidak boleh tertinggal
+        if os.path.exists(sementara):
+            os.remove(sementara)
+        raise
+    finally:
+        con.close()
+
+    os.replace(sementara, path_parquet)
+    return path_parquet
+
+
+def buka_koneksi(path_parquet=PATH_PARQUET, threads=None):
+    # view di atas file Parquet: filter & kolom yang dipakai query didorong ke scan file
+    con = duckdb.connect()
+    if threads:
+        con.execute(f"SET threads = {int(threads)}")
+    path = os.path.abspath(path_parquet).replace("'", "''")
+    con.execute(f"CREATE VIEW {NAMA_TABEL} AS SELECT * FROM read_parquet('{path}')")
+    # query dari panel hanya boleh membaca file Parquet penjualan
+    con.execute(f"SET allowed_paths = ['{path}']")
+    con.execute("SET enable_external_access = false")
+    return con
+
+
+def cek_query(sql):
+    # panel ini hanya untuk membaca data: satu statement SELECT/WITH
+    sql = sql.strip()
+    if not sql:
+        raise QueryTidakValid("Query kosong.")
+    statements = duckdb.extract_statements(sql)
+    if not statements:
+        raise QueryTidakValid("Query kosong.")
+    if len(statements) != 1:
+        raise QueryTidakValid("Hanya satu statement yang boleh dijalankan.")
+    if statements[0].type != duckdb.StatementType.SELECT:
+        raise QueryTidakValid("Hanya query SELECT yang diizinkan.")
+
+    # buang titik koma penutup, termasuk yang diikuti komentar ("...; -- catatan");
+    # tokenizer DuckDB melewati komentar, jadi token terakhir adalah ';' kalau ada
+    token = duckdb.tokenize(sql)
+    if token and sql[token[-1][0]] == ";":
+        sql = sql[:token[-1][0]].rstrip()
+    return sql
+
+
+def jalankan_query(con, sql, batas=BATAS_BARIS):
+    """Jalankan query dan kembalikan (DataFrame, terpotong).
+
+    Hanya ``batas`` baris pertama yang diambil ke pandas; ``terpotong``
+    bernilai True kalau hasil sebenarnya lebih panjang.
+    """
+    sql = cek_query(sql)
+    # query user diapit baris baru supaya komentar "--" di akhir tidak menelan ')'
+    hasil = con.execute(f"SELECT * FROM (\n{sql}\n) LIMIT {int(batas) + 1}").df()
+    terpotong = len(hasil) > batas
+    return hasil.head(batas), terpotong
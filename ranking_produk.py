@@ -0,0 +1,177 @@
+# ==========================================
+# RANKING PRODUK (TOP-K & TIER) UNTUK KATALOG BESAR
+# ==========================================
+# Tab Top Produk membagi produk jadi tiga tier (Sangat Laku / Laku /
+# Kurang Laku) berdasarkan peringkat Units Sold. Untuk data level SKU
+# (ratusan ribu produk) modul ini menghindari sort penuh:
+# - top-K dan batas tier pakai partial selection (np.argpartition)
+# - jalur data per chunk pakai sketch heavy-hitters (Misra-Gries) yang
+#   ukurannya tetap, ditambah HyperLogLog untuk menaksir jumlah produk
+import numpy as np
+import pandas as pd
+
+NAMA_TIER = ["Sangat Laku", "Laku", "Kurang Laku"]
+
+# jumlah baris maksimum per tier yang dikirim ke tabel di browser
+BATAS_TAMPIL = 100
+
+
+def top_k(data, kolom, k):
+    """Ambil k baris dengan ``kolom`` terbesar, terurut menurun, tanpa sort penuh."""
+    if len(data) > k:
+        nilai = data[kolom].to_numpy(dtype="float64")
+        idx = np.argpartition(-nilai, k - 1)[:k]
+        data = data.iloc[idx]
+    return data.sort_values(kolom, ascending=False)
+
+
+def bagi_tier(nilai):
+    """Kode tier per produk (0, 1, 2) berdasarkan peringkat sepertiga.
+
+    Sama dengan membagi hasil sort menurun menjadi ``n // 3`` baris
+    pertama, ``n // 3`` berikutnya, dan sisanya, tapi cukup dengan dua
+    titik partial selection.
+    """
+    nilai = np.asarray(nilai, dtype="float64")
+    n = len(nilai)
+    tier = np.full(n, 2, dtype="int8")
+    if n == 0:
+        return tier
+
+    bagi = max(1, n // 3)
+    batas = sorted({min(bagi, n) - 1, min(2 * bagi, n) - 1})
+    urutan = np.argpartition(-np.nan_to_num(nilai, nan=-np.inf), batas)
+    tier[urutan[:bagi]] = 0
+    tier[urutan[bagi:2 * bagi]] = 1
+    return tier
+
+
+def tier_produk(totals, kolom="Units Sold", batas=BATAS_TAMPIL):
+    """Bagi tabel total per produk menjadi tiga tier.
+
+    Hasil: list berisi ``(nama_tier, tabel_top, jumlah_produk)`` dengan
+    ``tabel_top`` maksimal ``batas`` baris terurut menurun.
+    """
+    tier = bagi_tier(totals[kolom].to_numpy())
+    hasil = []
+    for kode, nama in enumerate(NAMA_TIER):
+        bagian = totals[tier == kode]
+        hasil.append((nama, top_k(bagian, kolom, batas), len(bagian)))
+    return hasil
+
+
+class HyperLogLog:
+    # penaksir jumlah nilai unik dengan memori tetap (2^p register)
+
+    def __init__(self, p=14):
+        self.p = p
+        self.register = np.zeros(1 << p, dtype="uint8")
+
+    def update(self, kunci):
+        h = pd.util.hash_pandas_object(pd.Series(kunci), index=False).to_numpy()
+        idx = (h >> np.uint64(64 - self.p)).astype("int64")
+        # sisa bit (< 2^(64-p)) masih tepat direpresentasikan float64 untuk p >= 11
+        sisa_bit = 64 - self.p
+        sisa = (h & np.uint64((1 << sisa_bit) - 1)).astype("float64")
+        _, panjang = np.frexp(sisa)
+        rho = (sisa_bit - panjang + 1).astype("uint8")
+        np.maximum.at(self.register, idx, rho)
+
+    def taksiran(self):
+        m = len(self.register)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        e = alpha * m * m / np.sum(2.0 ** -self.register.astype("float64"))
+        kosong = np.count_nonzero(self.register == 0)
+        if e <= 2.5 * m and kosong:
+            e = m * np.log(m / kosong)
+        return int(round(e))
+
+
+class SketchProduk:
+    """Sketch heavy-hitters (Misra-Gries yang bisa digabung) untuk data per chunk.
+
+    Menyimpan paling banyak ``k`` produk. Total tiap produk yang dilacak
+    adalah taksiran bawah; total sebenarnya paling banyak lebih besar
+    ``galat`` (jumlah pengurangan kumulatif, <= total bobot / (k + 1)).
+    Kalau jumlah produk <= k, hasilnya eksak.
+    """
+
+    def __init__(self, k=10_000, kolom_kunci="Product", kolom_bobot="Units Sold"):
+        self.k = k
+        self.kolom_kunci = kolom_kunci
+        self.kolom_bobot = kolom_bobot
+        self.counter = pd.Series(dtype="float64")
+        self.galat = 0.0
+        self.total = 0.0
+        self.hll = HyperLogLog()
+
+    def update(self, chunk):
+        # agregasi chunk dulu, lalu digabung ke ringkasan berukuran tetap
+        per_chunk = chunk.groupby(self.kolom_kunci, sort=False, observed=True)[self.kolom_bobot].sum()
+        self.total += float(per_chunk.sum())
+        self.hll.update(per_chunk.index.to_numpy())
+
+        gabung = pd.concat([self.counter, per_chunk.astype("float64")])
+        gabung = gabung.groupby(level=0, sort=False).sum()
+        if len(gabung) > self.k:
+            # kurangi semua counter dengan nilai terbesar ke-(k+1), buang yang <= 0
+            potong = np.partition(gabung.to_numpy(), len(gabung) - self.k - 1)[len(gabung) - self.k - 1]
+            gabung = gabung - potong
+            gabung = gabung[gabung > 0]
+            self.galat += float(potong)
+        self.counter = gabung
+
+    def jumlah_produk(self):
+        if len(self.counter) < self.k and self.galat == 0:
+            return len(self.counter)
+        return max(len(self.counter), self.hll.taksiran())
+
+    def totals(self):
+        return pd.DataFrame({
+            self.kolom_kunci: self.counter.index.to_numpy(),
+            self.kolom_bobot: self.counter.to_numpy(),
+        })
+
+    def _rentang_tier(self):
+        # batas peringkat tiap tier dihitung dari taksiran jumlah produk, bukan dari counter
+        n = self.jumlah_produk()
+        bagi = max(1, n // 3)
+        return [(0, min(bagi, n)), (bagi, min(2 * bagi, n)), (2 * bagi, n)]
+
+    def tier(self, batas=BATAS_TAMPIL):
+        """Bagi produk yang dilacak ke tiga tier (format sama dengan ``tier_produk``).
+
+        Sketch hanya melacak paling banyak ``k`` produk teratas. Kalau
+        sepertiga jumlah produk lebih besar dari ``k``, tier bawah berada di
+        luar produk yang dilacak: tabelnya kosong dan yang diketahui hanya
+        jumlah produknya serta batas atas nilainya (``batas_atas_tier``).
+        """
+        # counter paling banyak k baris, jadi sort di sini tetap murah
+        totals = self.totals().sort_values(self.kolom_bobot, ascending=False)
+        hasil = []
+        for nama, (awal, akhir) in zip(NAMA_TIER, self._rentang_tier()):
+            hasil.append((nama, totals.iloc[awal:akhir].head(batas), max(0, akhir - awal)))
+        return hasil
+
+    def batas_atas_tier(self):
+        """Batas atas ``kolom_bobot`` untuk produk di tiap tier (None untuk tier teratas).
+
+        Produk yang tidak dilacak totalnya paling besar ``galat``, dan produk
+        yang dilacak paling besar counter + ``galat``, jadi nilai produk di
+        peringkat ke-r tidak melebihi counter ke-r + ``galat`` (atau ``galat``
+        kalau r di luar produk yang dilacak).
+        """
+        nilai = np.sort(self.counter.to_numpy())[::-1]
+        hasil = [None]
+        for awal, _ in self._rentang_tier()[1:]:
+            hasil.append(float(nilai[awal] + self.galat) if awal < len(nilai) else self.galat)
+        return hasil
+
+
+def sketch_dari_csv(path_csv, k=10_000, chunksize=1_000_000):
+    # jalur streaming: CSV dibaca per chunk sehingga memori tetap terbatas
+    sketch = SketchProduk(k=k)
+    for chunk in pd.read_csv(path_csv, usecols=["Product", "Units Sold"], chunksize=chunksize):
+        chunk["Product"] = chunk["Product"].astype(str).str.strip()
+        sketch.update(chunk)
+    return sketch
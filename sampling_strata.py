@@ -0,0 +1,122 @@
+# ==========================================
+# SAMPLING BERSTRATA UNTUK MODE CEPAT (APPROXIMATE)
+# ==========================================
+# Untuk file penjualan yang sangat besar, groupby penuh di setiap
+# perubahan filter terasa lambat. Modul ini menyimpan sampel berstrata
+# (per Region x Product) lalu menaksir total beserta selang kepercayaan.
+import math
+
+import numpy as np
+import pandas as pd
+
+KOLOM_STRATA = ["Region", "Product"]
+
+# nilai z untuk selang kepercayaan 95%
+Z_95 = 1.96
+
+
+def buat_sampel_strata(df, fraksi=0.02, min_per_strata=200, seed=42):
+    """Ambil sampel acak dari setiap strata Region x Product.
+
+    Setiap baris sampel membawa kolom ``_N`` (ukuran strata di populasi)
+    dan ``_n`` (ukuran strata di sampel) untuk dipakai saat menaksir.
+    """
+    if df.empty:
+        return df.assign(_N=pd.Series(dtype="int64"), _n=pd.Series(dtype="int64"))
+
+    rng = np.random.default_rng(seed)
+
+    # acak urutan baris sekali, lalu ambil n_h baris pertama tiap strata.
+    # Region/Product kosong (NaN) tetap jadi strata sendiri supaya tidak hilang dari estimasi.
+    acak = df.iloc[rng.permutation(len(df))]
+    grup = acak.groupby(KOLOM_STRATA, sort=False, observed=True, dropna=False)
+
+    ukuran = grup[KOLOM_STRATA[0]].transform("size").to_numpy()
+    target = np.minimum(
+        ukuran,
+        np.maximum(min_per_strata, np.ceil(ukuran * fraksi)).astype("int64"),
+    )
+    urutan = grup.cumcount().to_numpy()
+
+    ambil = urutan < target
+    sampel = acak[ambil].copy()
+    sampel["_N"] = ukuran[ambil]
+    sampel["_n"] = target[ambil]
+
+    return sampel
+
+
+def estimasi_total(sampel, kolom_nilai, kolom_grup, mask=None, z=Z_95):
+    """Taksir total ``kolom_nilai`` per ``kolom_grup`` dari sampel berstrata.
+
+    ``mask`` (boolean per baris sampel) dipakai untuk filter pencarian:
+    baris yang tidak cocok dianggap bernilai 0 (estimasi domain), bukan
+    dibuang, supaya bobot strata tetap benar.
+
+    Hasil: DataFrame dengan kolom ``kolom_grup``, ``kolom_nilai`` dan
+    ``"± CI"`` (setengah lebar selang kepercayaan).
+    """
+    kolom_ci = "± CI"
+    if sampel.empty:
+        return pd.DataFrame(columns=[kolom_grup, kolom_nilai, kolom_ci])
+
+    y = sampel[kolom_nilai].to_numpy(dtype="float64")
+    if mask is not None:
+        mask = np.asarray(mask, dtype=bool)
+        y = np.where(mask, y, 0.0)
+
+    data = pd.DataFrame({
+        "_h0": sampel[KOLOM_STRATA[0]].to_numpy(),
+        "_h1": sampel[KOLOM_STRATA[1]].to_numpy(),
+        "_g": sampel[kolom_grup].to_numpy(),
+        "_y": y,
+        "_y2": y * y,
+        "_N": sampel["_N"].to_numpy(dtype="float64"),
+        "_n": sampel["_n"].to_numpy(dtype="float64"),
+    })
+    if mask is not None:
+        # grup yang tidak punya satu pun baris cocok tidak perlu ditampilkan
+        data = data[data["_g"].isin(data.loc[mask, "_g"].unique())]
+
+    # jumlah y dan y^2 per (strata, grup); baris di luar grup bernilai 0
+    per_hg = (
+        data.groupby(["_h0", "_h1", "_g"], sort=False, observed=True, dropna=False)
+        .agg(s1=("_y", "sum"), s2=("_y2", "sum"), N=("_N", "first"), n=("_n", "first"))
+        .reset_index()
+    )
+
+    N = per_hg["N"].to_numpy()
+    n = per_hg["n"].to_numpy()
+    s1 = per_hg["s1"].to_numpy()
+    s2 = per_hg["s2"].to_numpy()
+
+    rata = s1 / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        varians = np.where(n > 1, (s2 - s1 * s1 / n) / (n - 1), 0.0)
+    varians = np.clip(varians, 0.0, None)
+
+    per_hg["total"] = N * rata
+    per_hg["var"] = N * N * (1 - n / N) * varians / n
+
+    hasil = per_hg.groupby("_g", sort=False, dropna=False).agg(total=("total", "sum"), var=("var", "sum"))
+
+    return pd.DataFrame({
+        kolom_grup: hasil.index.to_numpy(),
+        kolom_nilai: hasil["total"].to_numpy(),
+        kolom_ci: z * np.sqrt(hasil["var"].to_numpy()),
+    })
+
+
+def estimasi_total_keseluruhan(sampel, kolom_nilai, mask=None, z=Z_95):
+    """Taksir total satu kolom untuk seluruh data. Hasil: (total, ± CI)."""
+    if sampel.empty:
+        return 0.0, 0.0
+
+    satu_grup = sampel.assign(_semua=0)
+    hasil = estimasi_total(satu_grup, kolom_nilai, "_semua", mask=mask, z=z)
+    if hasil.empty:
+        return 0.0, 0.0
+
+    total = float(hasil[kolom_nilai].iloc[0])
+    ci = float(hasil["± CI"].iloc[0])
+    return total, (0.0 if math.isnan(ci) else ci)
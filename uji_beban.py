@@ -0,0 +1,262 @@
+# ==========================================
+# UJI BEBAN DASHBOARD (SESI SERENTAK)
+# ==========================================
+# Mensimulasikan N sesi Streamlit yang menjalankan analisis_nike_2020-2021.py
+# bersamaan (cari produk, rerun tanpa perubahan, checkbox, mode cepat, scraping),
+# lalu mencatat latensi rerun p50/p95/p99 dan memori per proses ke file
+# JSON yang bisa dibandingkan antar versi.
+#
+# Semua berjalan lokal: scraper diarahkan ke server pengganti lewat
+# NIKE_BASE_URL, jadi tidak ada request ke nike.com.
+#
+# Contoh:
+#   python uji_beban.py --sesi 8 --putaran 3 --output beban_lama.json
+#   python uji_beban.py --sesi 8 --putaran 3 --output beban_baru.json --bandingkan beban_lama.json
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+SCRIPT_DASHBOARD = "analisis_nike_2020-2021.py"
+KATA_KUNCI = ["women", "men", "apparel", "street", "athletic", "footwear"]
+
+
+# ==========================================
+# SERVER PENGGANTI NIKE.COM
+# ==========================================
+class HandlerNikePalsu(BaseHTTPRequestHandler):
+    # halaman daftar produk dengan struktur kartu yang sama seperti nike.com
+    def do_GET(self):
+        kartu = "".join(
+            f'<div class="product-card"><a href="/t/sepatu-{i}"><img src=""></a>'
+            f'<div class="product-card__title">Nike Palsu {i}</div>'
+            f'<div class="product-price">Rp {1_000_000 + i * 1000:,}</div></div>'
+            for i in range(24)
+        )
+        body = f"<html><body>{kartu}</body></html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def mulai_server_palsu():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HandlerNikePalsu)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# ==========================================
+# MEMORI PROSES
+# ==========================================
+def rss_mb():
+    # RSS saat ini (Linux: /proc/self/statm), fallback ke puncak ru_maxrss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return puncak_rss_mb()
+
+
+def puncak_rss_mb():
+    # modul resource hanya ada di Unix; di Windows puncak memori tidak dicatat
+    try:
+        import resource
+    except ImportError:
+        return None
+    puncak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS melaporkan byte, Linux kilobyte
+    return puncak / 2**20 if sys.platform == "darwin" else puncak / 1024
+
+
+# ==========================================
+# SATU SESI PENGGUNA
+# ==========================================
+def jalankan_sesi(id_sesi, putaran, scrape, jeda, seed):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + id_sesi)
+    catatan = []
+
+    def ukur(langkah, aksi=None):
+        if aksi is not None:
+            aksi()
+        mulai = time.perf_counter()
+        at.run()
+        catatan.append({
+            "sesi": id_sesi,
+            "langkah": langkah,
+            "detik": time.perf_counter() - mulai,
+            "error": len(at.exception),
+        })
+        if jeda:
+            time.sleep(rng.uniform(0, jeda))
+
+    at = AppTest.from_file(SCRIPT_DASHBOARD, default_timeout=600)
+    ukur("muat_awal")
+
+    for _ in range(putaran):
+        kata = rng.choice(KATA_KUNCI)
+        ukur("cari", lambda: at.text_input(key="input_search_hist").set_value(kata))
+        # rerun tanpa perubahan widget: biaya dasar satu rerun (mis. interaksi
+        # peta st_folium atau pindah tab), AppTest tidak bisa mensimulasikan keduanya
+        ukur("rerun_kosong")
+        ukur("toggle_tabel", lambda: at.checkbox[0].set_value(not at.checkbox[0].value))
+        ukur("mode_cepat", lambda: at.sidebar.toggle[0].set_value(not at.sidebar.toggle[0].value))
+        ukur("hapus_cari", lambda: at.text_input(key="input_search_hist").set_value(""))
+        if scrape:
+            tombol = next(b for b in at.button if "Mulai Scraping" in b.label)
+            ukur("scrape", tombol.click)
+
+    return catatan
+
+
+def jalankan_proses(id_proses, jumlah_sesi, putaran, scrape, jeda, seed):
+    # satu proses = satu server Streamlit; sesi di dalamnya berbagi cache seperti aslinya
+    from streamlit import logger
+    logger.set_log_level("error")
+
+    server, base_url = mulai_server_palsu()
+    os.environ["NIKE_BASE_URL"] = base_url
+
+    rss_sampel = []
+    selesai = threading.Event()
+
+    def sampler():
+        while not selesai.is_set():
+            mb = rss_mb()
+            if mb is not None:
+                rss_sampel.append(mb)
+            selesai.wait(0.2)
+
+    threading.Thread(target=sampler, daemon=True).start()
+    with ThreadPoolExecutor(max_workers=jumlah_sesi) as pool:
+        hasil = pool.map(
+            lambda i: jalankan_sesi(id_proses * jumlah_sesi + i, putaran, scrape, jeda, seed),
+            range(jumlah_sesi),
+        )
+        catatan = [c for per_sesi in hasil for c in per_sesi]
+    selesai.set()
+    server.shutdown()
+
+    return {
+        "proses": id_proses,
+        "catatan": catatan,
+        "memori_mb": {
+            "rata_rata": float(np.mean(rss_sampel)) if rss_sampel else None,
+            "puncak": puncak_rss_mb(),
+        },
+    }
+
+
+# ==========================================
+# LAPORAN
+# ==========================================
+def ringkas(detik):
+    detik = np.asarray(detik, dtype="float64")
+    p50, p95, p99 = np.percentile(detik, [50, 95, 99])
+    return {"n": int(len(detik)), "p50": p50, "p95": p95, "p99": p99, "maks": float(detik.max())}
+
+
+def buat_laporan(hasil_proses, args, durasi):
+    catatan = [c for h in hasil_proses for c in h["catatan"]]
+    per_langkah = {}
+    for c in catatan:
+        per_langkah.setdefault(c["langkah"], []).append(c["detik"])
+
+    try:
+        versi = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        versi = None
+
+    return {
+        "versi": versi,
+        "waktu": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "konfigurasi": {
+            "proses": args.proses, "sesi_per_proses": args.sesi,
+            "putaran": args.putaran, "scrape": args.scrape, "jeda": args.jeda,
+        },
+        "durasi_detik": durasi,
+        "jumlah_error": sum(c["error"] for c in catatan),
+        "latensi": {
+            "semua": ringkas([c["detik"] for c in catatan]),
+            **{langkah: ringkas(d) for langkah, d in per_langkah.items()},
+        },
+        "memori_mb": {f"proses_{h['proses']}": h["memori_mb"] for h in hasil_proses},
+    }
+
+
+def cetak_laporan(laporan):
+    print(f"\nVersi {laporan['versi']} | {laporan['durasi_detik']:.1f} s | error: {laporan['jumlah_error']}")
+    print(f"{'langkah':<18}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for langkah, r in laporan["latensi"].items():
+        print(f"{langkah:<18}{r['n']:>6}{r['p50']:>10.3f}{r['p95']:>10.3f}{r['p99']:>10.3f}")
+    for nama, m in laporan["memori_mb"].items():
+        rata, puncak = (f"{v:.0f} MB" if v is not None else "-" for v in (m["rata_rata"], m["puncak"]))
+        print(f"{nama}: rata-rata {rata}, puncak {puncak}")
+
+
+def bandingkan(lama, baru):
+    print(f"\nPerbandingan {lama['versi']} -> {baru['versi']} (detik, perubahan %)")
+    print(f"{'langkah':<18}{'p50':>22}{'p95':>22}{'p99':>22}")
+    for langkah, r in baru["latensi"].items():
+        if langkah not in lama["latensi"]:
+            continue
+        kolom = []
+        for p in ("p50", "p95", "p99"):
+            a, b = lama["latensi"][langkah][p], r[p]
+            kolom.append(f"{a:.3f}->{b:.3f} ({(b - a) / a * 100:+.0f}%)" if a else f"{a:.3f}->{b:.3f}")
+        print(f"{langkah:<18}" + "".join(f"{k:>22}" for k in kolom))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uji beban lokal untuk dashboard Streamlit.")
+    parser.add_argument("--sesi", type=int, default=4, help="Sesi serentak per proses")
+    parser.add_argument("--proses", type=int, default=1, help="Jumlah proses (server) paralel")
+    parser.add_argument("--putaran", type=int, default=3, help="Putaran skenario per sesi")
+    parser.add_argument("--scrape", action="store_true", help="Sertakan klik scraping ke server pengganti")
+    parser.add_argument("--jeda", type=float, default=0.0, help="Jeda acak maksimum antar aksi (detik)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="laporan_beban.json")
+    parser.add_argument("--bandingkan", help="Laporan JSON versi sebelumnya")
+    args = parser.parse_args()
+
+    mulai = time.perf_counter()
+    argumen = (args.sesi, args.putaran, args.scrape, args.jeda, args.seed)
+    if args.proses == 1:
+        hasil = [jalankan_proses(0, *argumen)]
+    else:
+        with ProcessPoolExecutor(max_workers=args.proses) as pool:
+            hasil = list(pool.map(jalankan_proses, range(args.proses), *[[a] * args.proses for a in argumen]))
+    laporan = buat_laporan(hasil, args, time.perf_counter() - mulai)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(laporan, f, indent=2)
+
+    cetak_laporan(laporan)
+    print(f"\nLaporan tersimpan di {args.output}")
+
+    if args.bandingkan:
+        with open(args.bandingkan, encoding="utf-8") as f:
+            bandingkan(json.load(f), laporan)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# ==========================================
+# VALIDASI & DEDUPLIKASI DATA PENJUALAN
+# ==========================================
+# Tahap validasi bersama untuk dashboard dan script tugas:
+# - hash per baris dihitung sekali untuk deteksi duplikat
+#   (load ulang / data tambahan cukup membandingkan hash, bukan baris penuh)
+# - cek skema, tanggal, dan rentang nilai secara vektor (tanpa apply per baris)
+# - hasilnya berupa laporan kualitas yang bisa ditulis ke file JSON
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+KOLOM_WAJIB = [
+    "Invoice Date", "Product", "Region", "Retailer", "Sales Method",
+    "State", "Price per Unit", "Total Sales", "Units Sold",
+]
+KOLOM_TEKS = ["Product", "Region", "Retailer", "Sales Method", "State"]
+KOLOM_ANGKA = ["Price per Unit", "Total Sales", "Units Sold"]
+
+FORMAT_TANGGAL = "%d-%m-%Y"
+
+# toleransi relatif untuk Total Sales ≈ Price per Unit × Units Sold
+TOLERANSI_TOTAL = 0.01
+
+PATH_HASH = os.path.join("cache", "hash_baris.npy")
+PATH_LAPORAN = os.path.join("cache", "laporan_kualitas.json")
+
+
+def _rapikan_teks(kolom, title=False):
+    # strip/title cukup dilakukan pada nilai unik, lalu dipetakan balik lewat kode kategori
+    kategori = kolom.astype("category")
+    baru = kategori.cat.categories.astype(str).str.strip()
+    if title:
+        baru = baru.str.title()
+
+    # beberapa nilai bisa menyatu setelah dirapikan (mis. "texas " dan "Texas")
+    kode_baru, unik = pd.factorize(baru)
+    kode = kategori.cat.codes.to_numpy()
+    kode = np.where(kode >= 0, kode_baru[kode], -1)
+    return pd.Categorical.from_codes(kode, categories=unik)
+
+
+def normalisasi(df):
+    # rapikan nama kolom dan isi kolom teks sebelum di-hash
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    for kolom in KOLOM_TEKS:
+        if kolom in df.columns:
+            df[kolom] = _rapikan_teks(df[kolom], title=(kolom == "State"))
+    # tanggal juga dijadikan kategori: hash dan parsing cukup per nilai unik
+    if "Invoice Date" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["Invoice Date"]):
+        df["Invoice Date"] = _rapikan_teks(df["Invoice Date"])
+    return df
+
+
+def hash_baris(df, kolom=None):
+    """Hash uint64 per baris (kolom teks sebaiknya sudah kategori supaya cepat).
+
+    Default-nya semua kolom ikut di-hash, sama seperti ``drop_duplicates()``,
+    jadi baris yang hanya beda di kolom tambahan tidak dianggap duplikat.
+    """
+    data = df if kolom is None else df[kolom]
+    return pd.util.hash_pandas_object(data, index=False).to_numpy()
+
+
+def cek_skema(df):
+    hilang = [k for k in KOLOM_WAJIB if k not in df.columns]
+    bukan_angka = [
+        k for k in KOLOM_ANGKA
+        if k in df.columns and not pd.api.types.is_numeric_dtype(df[k])
+    ]
+    return {"kolom_hilang": hilang, "kolom_bukan_angka": bukan_angka}
+
+
+def cek_nilai(df, toleransi=TOLERANSI_TOTAL):
+    # semua cek dilakukan per kolom sebagai array, bukan per baris
+    # nilai yang bukan angka (mis. "$6000") dihitung sebagai kosong, bukan bikin crash
+    hasil = {}
+    masalah = np.zeros(len(df), dtype=bool)
+    angka = {}
+
+    for kolom in KOLOM_ANGKA:
+        if kolom in df.columns:
+            nilai = pd.to_numeric(df[kolom], errors="coerce").to_numpy(dtype="float64")
+            kosong = np.isnan(nilai)
+            negatif = nilai < 0
+            hasil[f"{kolom} kosong"] = int(kosong.sum())
+            hasil[f"{kolom} negatif"] = int(negatif.sum())
+            masalah |= kosong | negatif
+            angka[kolom] = nilai
+
+    if len(angka) == len(KOLOM_ANGKA):
+        harga, total, unit = angka["Price per Unit"], angka["Total Sales"], angka["Units Sold"]
+        lengkap = ~(np.isnan(harga) | np.isnan(total) | np.isnan(unit))
+        tidak_cocok = lengkap & ~np.isclose(total, harga * unit, rtol=toleransi, atol=0.5)
+        hasil["Total Sales != Price x Units"] = int(tidak_cocok.sum())
+
+    hasil["baris_bermasalah"] = int(masalah.sum())
+    return hasil, masalah
+
+
+def parse_tanggal(df, kolom="Invoice Date", fmt=FORMAT_TANGGAL):
+    # tanggal yang gagal di-parse tetap jadi NaT, tapi jumlahnya dilaporkan.
+    # Parsing hanya dilakukan pada nilai unik lalu dipetakan balik.
+    kategori = df[kolom].astype("category")
+    unik = pd.to_datetime(kategori.cat.categories, format=fmt, errors="coerce")
+    kode = kategori.cat.codes.to_numpy()
+    tanggal = pd.Series(unik.take(kode, allow_fill=True), index=df.index)
+    gagal = (kode >= 0) & tanggal.isna().to_numpy()
+    return tanggal, int(gagal.sum())
+
+
+def validasi(df, hash_lama=None, hapus_duplikat=True):
+    """Normalisasi, deduplikasi, dan cek kualitas satu batch data.
+
+    ``hash_lama`` (array hash dari load sebelumnya) dipakai untuk data
+    tambahan: baris yang hash-nya sudah ada dianggap duplikat.
+    Hasil: (df_bersih, hash baris df_bersih, laporan).
+    """
+    laporan = {"jumlah_baris_awal": int(len(df))}
+    laporan["skema"] = cek_skema(df)
+
+    df = normalisasi(df)
+    hashes = hash_baris(df)
+
+    duplikat = pd.Series(hashes).duplicated().to_numpy()
+    laporan["duplikat_dalam_batch"] = int(duplikat.sum())
+    if hash_lama is not None and len(hash_lama):
+        sudah_ada = np.isin(hashes, hash_lama)
+        laporan["duplikat_dengan_data_lama"] = int(sudah_ada.sum())
+        duplikat |= sudah_ada
+
+    if hapus_duplikat and duplikat.any():
+        df = df[~duplikat]
+        hashes = hashes[~duplikat]
+
+    if "Invoice Date" in df.columns:
+        df["Invoice Date"], laporan["tanggal_tidak_valid"] = parse_tanggal(df)
+
+    laporan["nilai"], _ = cek_nilai(df)
+    laporan["jumlah_baris_akhir"] = int(len(df))
+
+    return df, hashes, laporan
+
+
+def muat_hash(path=PATH_HASH):
+    try:
+        return np.load(path)
+    except OSError:
+        return np.empty(0, dtype="uint64")
+
+
+def simpan_hash(hashes, path=PATH_HASH):
+    # disimpan terurut supaya pencarian np.isin berikutnya cepat
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.save(path, np.sort(np.asarray(hashes, dtype="uint64")))
+
+
+def tambah_data(df_baru, path_hash=PATH_HASH):
+    # data tambahan cukup dibandingkan dengan hash yang tersimpan
+    hash_lama = muat_hash(path_hash)
+    df_baru, hash_baru, laporan = validasi(df_baru, hash_lama=hash_lama)
+    simpan_hash(np.concatenate([hash_lama, hash_baru]), path_hash)
+    return df_baru, laporan
+
+
+def tulis_laporan(laporan, path=PATH_LAPORAN):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(laporan, f, indent=2, ensure_ascii=False)
+    return path